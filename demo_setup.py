@@ -16,7 +16,7 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent / "src" / "agent" / "tools"))
 
 from langchain_notifier import send_notification, THRESHOLD, load_config
-from tavily_price_tracker import tavily_price_tracker
+from tavily_price_tracker import tavily_price_tracker, save_flight_data, read_recent_searches
 
 class DemoSetup:
     """Demo setup and testing class"""
@@ -52,8 +52,7 @@ class DemoSetup:
         data_dir.mkdir(exist_ok=True)
         
         for from_city, to_city, max_price in demo_routes:
-            filename = f"flight_prices_{from_city}_{to_city}.json"
-            filepath = data_dir / filename
+            filename = f"flight_prices_{from_city}_{to_city}.jsonl"
             
             # Create realistic demo data with some price drops
             demo_flights = []
@@ -76,19 +75,8 @@ class DemoSetup:
                 }
                 demo_flights.append(flight)
             
-            demo_data = {
-                "route": f"{from_city} to {to_city}",
-                "searches": [
-                    {
-                        "search_timestamp": datetime.now().isoformat(),
-                        "flights": demo_flights,
-                        "total_flights_found": len(demo_flights)
-                    }
-                ]
-            }
-            
-            with open(filepath, 'w') as f:
-                json.dump(demo_data, f, indent=2)
+            # Appended as the latest search for the route
+            save_flight_data(demo_flights, from_city, to_city)
             
             print(f"   ✅ Created {filename} with {len(demo_flights)} flights")
         
@@ -125,15 +113,14 @@ class DemoSetup:
         
         # Load demo data and test notifications
         data_dir = Path("data")
-        flight_files = list(data_dir.glob("flight_prices_*.json"))
+        flight_files = list(data_dir.glob("flight_prices_*.jsonl"))
         
         for file_path in flight_files:
             try:
-                with open(file_path, 'r') as f:
-                    data = json.load(f)
+                searches = read_recent_searches(file_path, 1)
                 
-                if data.get("searches"):
-                    latest_search = data["searches"][-1]
+                if searches:
+                    latest_search = searches[-1]
                     flights = latest_search.get("flights", [])
                     
                     for flight in flights:
@@ -219,7 +206,7 @@ Windsurf UI, and Firebase. Let me show you how it works!"
 
 ### Step 2: Show Real-time Data (2 minutes)
 - Open terminal and show the data files: ls data/
-- Show a flight data file: cat data/flight_prices_Toronto_Vancouver.json
+- Show a flight data file: cat data/flight_prices_Toronto_Vancouver.jsonl
 - Point out: "This is real flight data fetched by our Tavily integration"
 
 ### Step 3: Demonstrate LangChain Agent (2 minutes)
@@ -320,7 +307,7 @@ tail -f data/notification_history.json
 - [ ] Test UI: npm run dev (should show real flight data)
 - [ ] Test notifications: python test_notifications.py
 - [ ] Test Discord: Check webhook is working
-- [ ] Prepare demo data: Ensure data/flight_prices_*.json exist
+- [ ] Prepare demo data: Ensure data/flight_prices_*.jsonl exist
 
 ## DEMO EQUIPMENT:
 - [ ] Laptop with all terminals ready
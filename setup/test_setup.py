@@ -8,6 +8,9 @@ import sys
 import os
 from dotenv import load_dotenv
 
+# Load .env once at import; the checks below only read os.environ
+load_dotenv(override=False)
+
 def test_nodejs_setup():
     """Test if Node.js dependencies are installed"""
     print("\n📦 Testing Node.js setup...")
@@ -76,8 +79,6 @@ def test_environment_variables():
     """Test if environment variables are loaded"""
     print("\n🔑 Testing environment variables...")
     
-    load_dotenv()
-    
     required_vars = [
         ('TAVILY_API_KEY', 'Tavily search API'),
         ('OPENAI_API_KEY', 'OpenAI/LangChain API'),
@@ -177,8 +178,6 @@ def run_quick_api_test():
     """Quick test to verify API connectivity (if keys are set)"""
     print("\n🌐 Testing API connectivity...")
     
-    load_dotenv()
-    
     # Test if we can at least import and initialize (without making actual calls)
     tavily_key = os.getenv('TAVILY_API_KEY')
     openai_key = os.getenv('OPENAI_API_KEY')
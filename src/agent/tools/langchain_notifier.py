@@ -1,4 +1,4 @@
-import json
+import orjson
 import asyncio
 import aiofiles
 import time
@@ -12,6 +12,7 @@ sys.path.append(str(Path(__file__).parent.parent))
 from discord_notifier import DiscordNotifier
 from notification_manager import NotificationManager
 from real_time_data_manager import RealTimeDataManager
+from tools.tavily_price_tracker import aclose_http_session
 from performance_optimizer import PerformanceOptimizer
 
 # Load notification config from JSON file
@@ -23,8 +24,8 @@ def load_config():
         dict: Configuration dictionary.
     """
     try:
-        with open(CONFIG_FILE, "r") as f:
-            return json.load(f)
+        with open(CONFIG_FILE, "rb") as f:
+            return orjson.loads(f.read())
     except Exception as e:
         print(f"❌ Error loading config: {e}")
         # Fallback defaults
@@ -273,6 +274,8 @@ async def main():
         print(f"❌ Fatal error in main: {e}")
         # Ensure cleanup happens even on error
         await performance_optimizer.perform_cleanup()
+    finally:
+        await aclose_http_session()
 
 if __name__ == "__main__":
     asyncio.run(main()) 
\ No newline at end of file
@@ -2,6 +2,7 @@ import asyncio
 import psutil
 import time
 import json
+import orjson
 import os
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -34,6 +35,10 @@ class PerformanceOptimizer:
         self.max_sleep_interval = self.config.get("max_sleep_interval", 600)  # Maximum sleep interval (seconds)
         self.adaptive_sleep = self.config.get("adaptive_sleep", True)  # Enable adaptive sleep
         self.memory_threshold = self.config.get("memory_threshold", 80)  # Memory usage threshold (%)
+        self.idle_factor = self.config.get("idle_factor", 1.5)  # Interval multiplier per idle cycle
+        self.active_factor = self.config.get("active_factor", 0.7)  # Interval multiplier per active cycle
+        self.sleep_threshold = self.config.get("sleep_threshold", 1800)  # Idle time before entering sleep mode (seconds)
+        self.sleep_interval = self.config.get("sleep_interval", self.max_sleep_interval)  # Interval used in sleep mode (seconds)
         
         # Performance tracking
         self.performance_metrics = {
@@ -64,6 +69,7 @@ class PerformanceOptimizer:
         self.memory_monitor_enabled = self.config.get("memory_monitoring", True)
         self.last_memory_check = 0
         self.memory_check_interval = 60  # How often to check memory (seconds)
+        self.track_system_memory = self.config.get("track_system_memory", False)  # Also sample system-wide memory
     
     def _setup_signal_handlers(self):
         """
@@ -112,6 +118,9 @@ class PerformanceOptimizer:
     def optimize_sleep_interval(self, notifications_sent: int = 0, data_changed: bool = False) -> int:
         """
         Dynamically adjust the sleep interval based on recent activity.
+        The interval shrinks by active_factor on activity and grows by idle_factor
+        when idle; after sleep_threshold seconds without activity it jumps
+        straight to sleep_interval.
         Args:
             notifications_sent (int): Number of notifications sent in last cycle.
             data_changed (bool): Whether new data was detected.
@@ -125,37 +134,23 @@ class PerformanceOptimizer:
         current_time = time.time()
         time_since_activity = current_time - self.last_activity_time
         
-        # Increase activity level if there was activity
+        # Activity: raise activity level and shrink the interval geometrically
         if notifications_sent > 0 or data_changed:
             self.activity_level = min(100, self.activity_level + 20)
             self.last_activity_time = current_time
+            interval = max(self.min_sleep_interval, self.current_sleep_interval * self.active_factor)
         else:
             # Gradually decrease activity level over time
             decay_rate = 5  # Decrease by 5 points per minute of inactivity
             decay_amount = (time_since_activity / 60) * decay_rate
             self.activity_level = max(0, self.activity_level - decay_amount)
+            
+            if time_since_activity > self.sleep_threshold:
+                interval = self.sleep_interval  # Sleep mode: long idle period
+            else:
+                interval = min(self.max_sleep_interval, self.current_sleep_interval * self.idle_factor)
         
-        # Calculate optimal sleep interval based on activity
-        if self.activity_level > 80:
-            optimal_interval = self.min_sleep_interval  # High activity: check frequently
-        elif self.activity_level > 50:
-            optimal_interval = (self.min_sleep_interval + self.max_sleep_interval) // 2  # Medium
-        else:
-            optimal_interval = self.max_sleep_interval  # Low activity: check less often
-        
-        # Smooth transition to avoid sudden jumps
-        change_rate = 0.1  # 10% change per cycle
-        if optimal_interval > self.current_sleep_interval:
-            self.current_sleep_interval = min(optimal_interval, 
-                                            self.current_sleep_interval * (1 + change_rate))
-        else:
-            self.current_sleep_interval = max(optimal_interval, 
-                                            self.current_sleep_interval * (1 - change_rate))
-        
-        # Clamp to allowed range
-        self.current_sleep_interval = max(self.min_sleep_interval, 
-                                        min(self.max_sleep_interval, 
-                                            int(self.current_sleep_interval)))
+        self.current_sleep_interval = int(interval)
         
         # Track sleep intervals for metrics
         self.performance_metrics["sleep_intervals"].append({
@@ -193,16 +188,14 @@ class PerformanceOptimizer:
                 return self.data_cache[cache_key]
         
         try:
-            # Check if file exists
-            if not file_path.exists():
+            # Single stat call: covers the existence check and the size metric
+            try:
+                file_stat = os.stat(file_path)
+            except FileNotFoundError:
                 return []
             
-            file_mtime = file_path.stat().st_mtime
-            
-            # Load data from file (thread-safe)
-            async with asyncio.Lock():
-                with open(file_path, 'r') as f:
-                    data = json.load(f)
+            # Read and parse in a worker thread so the event loop is not blocked
+            data = await asyncio.to_thread(self._read_json, file_path)
             
             # Cache the data
             if cache_key:
@@ -214,7 +207,7 @@ class PerformanceOptimizer:
                 "timestamp": start_time,
                 "load_time": load_time,
                 "source": "file",
-                "file_size": file_path.stat().st_size,
+                "file_size": file_stat.st_size,
                 "cache_key": cache_key
             })
             
@@ -224,9 +217,22 @@ class PerformanceOptimizer:
             print(f"❌ Error in efficient data load: {e}")
             return []
     
+    @staticmethod
+    def _read_json(file_path: Path):
+        """
+        Read and parse a JSON file.
+        Args:
+            file_path (Path): Path to the data file.
+        Returns:
+            Parsed JSON data.
+        """
+        with open(file_path, 'rb') as f:
+            return orjson.loads(f.read())
+    
     def check_memory_usage(self) -> Dict[str, float]:
         """
-        Check and record current process and system memory/CPU usage.
+        Check and record current process memory/CPU usage, plus system memory
+        when track_system_memory is enabled.
         Returns:
             Dict[str, float]: Memory and CPU usage metrics.
         """
@@ -243,17 +249,18 @@ class PerformanceOptimizer:
             memory_percent = process.memory_percent()
             cpu_percent = process.cpu_percent()
             
-            # Get system memory info
-            system_memory = psutil.virtual_memory()
-            
             metrics = {
                 "process_memory_mb": memory_info.rss / 1024 / 1024,
                 "process_memory_percent": memory_percent,
-                "process_cpu_percent": cpu_percent,
-                "system_memory_percent": system_memory.percent,
-                "system_memory_available_gb": system_memory.available / 1024 / 1024 / 1024
+                "process_cpu_percent": cpu_percent
             }
             
+            # System memory info is only sampled when requested
+            if self.track_system_memory:
+                system_memory = psutil.virtual_memory()
+                metrics["system_memory_percent"] = system_memory.percent
+                metrics["system_memory_available_gb"] = system_memory.available / 1024 / 1024 / 1024
+            
             # Track metrics
             self.performance_metrics["memory_usage"].append({
                 "timestamp": current_time,
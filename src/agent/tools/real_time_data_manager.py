@@ -1,13 +1,11 @@
 import asyncio
-import aiofiles
-import json
 import os
 import time
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 import threading
-from tavily_price_tracker import tavily_price_tracker
+from tavily_price_tracker import tavily_price_tracker, read_recent_searches, invalidate_cached_search
 
 class RealTimeDataManager:
     """Manages real-time flight data updates with concurrent access safety."""
@@ -20,6 +18,47 @@ class RealTimeDataManager:
         self.file_locks = {}  # Thread locks for file access
         self.data_dir.mkdir(parents=True, exist_ok=True)
         
+        # Known routes, so we don't glob the data directory on every tick
+        self._routes: Set[Tuple[str, str]] = set()
+        self._routes_scanned_at = 0
+        self._scan_routes()
+    
+    def _scan_routes(self):
+        """Rebuild the route registry with a single pass over the data directory."""
+        routes = set()
+        try:
+            with os.scandir(self.data_dir) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if not name.startswith("flight_prices_"):
+                        continue
+                    # Legacy .json histories are migrated to .jsonl on first read
+                    if name.endswith(".jsonl"):
+                        stem = name[len("flight_prices_"):-len(".jsonl")]
+                    elif name.endswith(".json") and not name.endswith(".summary.json"):
+                        stem = name[len("flight_prices_"):-len(".json")]
+                    else:
+                        continue
+                    parts = stem.split("_")
+                    if len(parts) >= 2:
+                        routes.add((parts[0], parts[1]))
+        except OSError as e:
+            print(f"❌ Error scanning data directory {self.data_dir}: {e}")
+            return
+        
+        self._routes = routes
+        self._routes_scanned_at = time.time()
+    
+    def register_route(self, from_city: str, to_city: str):
+        """Record a route so it is picked up without rescanning the data directory."""
+        self._routes.add((from_city, to_city))
+    
+    def _get_routes(self) -> List[Tuple[str, str]]:
+        """Get known routes, rescanning the data directory once per refresh interval."""
+        if time.time() - self._routes_scanned_at > self.refresh_interval:
+            self._scan_routes()
+        return sorted(self._routes)
+        
     def _get_file_lock(self, filename: str) -> threading.Lock:
         """Get or create a thread lock for a specific file."""
         if filename not in self.file_locks:
@@ -28,7 +67,7 @@ class RealTimeDataManager:
     
     async def load_flight_data(self, from_city: str, to_city: str) -> List[Dict]:
         """Load flight data for a specific route with caching."""
-        filename = f"flight_prices_{from_city}_{to_city}.json"
+        filename = f"flight_prices_{from_city}_{to_city}.jsonl"
         file_path = self.data_dir / filename
         
         # Check if we need to refresh data
@@ -44,23 +83,19 @@ class RealTimeDataManager:
         lock = self._get_file_lock(filename)
         with lock:
             try:
-                if file_path.exists():
-                    async with aiofiles.open(file_path, 'r') as f:
-                        content = await f.read()
-                        data = json.loads(content)
-                        
-                        # Extract latest flights from the most recent search
-                        if data.get("searches"):
-                            latest_search = data["searches"][-1]
-                            flights = latest_search.get("flights", [])
-                            
-                            # Cache the data
-                            self.data_cache[cache_key] = flights
-                            return flights
-                        
-                        return []
-                else:
+                # Only the most recent search is parsed, not the whole history
+                searches = await asyncio.to_thread(read_recent_searches, file_path, 1)
+                if not searches:
                     return []
+                
+                self.register_route(from_city, to_city)
+                
+                # Extract latest flights from the most recent search
+                flights = searches[-1].get("flights", [])
+                
+                # Cache the data
+                self.data_cache[cache_key] = flights
+                return flights
                     
             except Exception as e:
                 print(f"❌ Error loading flight data for {from_city} to {to_city}: {e}")
@@ -82,16 +117,15 @@ class RealTimeDataManager:
         print(f"🔄 Refreshing flight data for {from_city} to {to_city}...")
         
         try:
-            # Use the existing Tavily price tracker
-            params = {
-                "FROM": from_city,
-                "TO": to_city,
-                "maxPrice": 1000  # High threshold to get all flights
-            }
+            # A scheduled refresh must not be answered from the tool's result cache
+            invalidate_cached_search(from_city, to_city, "1000")
             
-            # Call the Tavily API (this is synchronous, so we run it in executor)
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(None, tavily_price_tracker, params)
+            # Call the Tavily API without blocking the event loop
+            result = await tavily_price_tracker.ainvoke({
+                "from_city": from_city,
+                "to_city": to_city,
+                "max_price": "1000"  # High threshold to get all flights
+            })
             
             # Update last refresh time
             route_key = f"{from_city}_{to_city}"
@@ -106,23 +140,13 @@ class RealTimeDataManager:
         """Get all available flight data from all routes."""
         all_flights = []
         
-        # Get all flight price files
-        flight_files = list(self.data_dir.glob("flight_prices_*.json"))
-        
-        for file_path in flight_files:
+        for from_city, to_city in self._get_routes():
             try:
-                # Extract route from filename
-                filename = file_path.stem
-                parts = filename.replace("flight_prices_", "").split("_")
-                if len(parts) >= 2:
-                    from_city = parts[0]
-                    to_city = parts[1]
-                    
-                    flights = await self.load_flight_data(from_city, to_city)
-                    all_flights.extend(flights)
+                flights = await self.load_flight_data(from_city, to_city)
+                all_flights.extend(flights)
                     
             except Exception as e:
-                print(f"❌ Error processing {file_path}: {e}")
+                print(f"❌ Error processing {from_city} to {to_city}: {e}")
         
         return all_flights
     
@@ -155,29 +179,24 @@ class RealTimeDataManager:
             "cache_hits": len(self.data_cache)
         }
         
-        flight_files = list(self.data_dir.glob("flight_prices_*.json"))
-        stats["total_routes"] = len(flight_files)
+        routes = self._get_routes()
+        stats["total_routes"] = len(routes)
         
-        for file_path in flight_files:
+        for from_city, to_city in routes:
             try:
-                filename = file_path.stem
-                parts = filename.replace("flight_prices_", "").split("_")
-                if len(parts) >= 2:
-                    from_city = parts[0]
-                    to_city = parts[1]
-                    route_key = f"{from_city}_{to_city}"
-                    
-                    # Get last refresh time
-                    last_refresh = self.last_refresh.get(route_key, 0)
-                    if last_refresh > 0:
-                        stats["last_refresh_times"][route_key] = datetime.fromtimestamp(last_refresh).isoformat()
-                    
-                    # Count flights in cache
-                    if route_key in self.data_cache:
-                        stats["total_flights"] += len(self.data_cache[route_key])
+                route_key = f"{from_city}_{to_city}"
+                
+                # Get last refresh time
+                last_refresh = self.last_refresh.get(route_key, 0)
+                if last_refresh > 0:
+                    stats["last_refresh_times"][route_key] = datetime.fromtimestamp(last_refresh).isoformat()
+                
+                # Count flights in cache
+                if route_key in self.data_cache:
+                    stats["total_flights"] += len(self.data_cache[route_key])
                         
             except Exception as e:
-                print(f"❌ Error getting stats for {file_path}: {e}")
+                print(f"❌ Error getting stats for {from_city} to {to_city}: {e}")
         
         return stats
     
@@ -185,18 +204,11 @@ class RealTimeDataManager:
         """Force refresh all available routes."""
         print("🔄 Forcing refresh of all flight data...")
         
-        flight_files = list(self.data_dir.glob("flight_prices_*.json"))
-        
-        for file_path in flight_files:
+        for from_city, to_city in self._get_routes():
             try:
-                filename = file_path.stem
-                parts = filename.replace("flight_prices_", "").split("_")
-                if len(parts) >= 2:
-                    from_city = parts[0]
-                    to_city = parts[1]
-                    await self._refresh_flight_data(from_city, to_city)
+                await self._refresh_flight_data(from_city, to_city)
                     
             except Exception as e:
-                print(f"❌ Error refreshing {file_path}: {e}")
+                print(f"❌ Error refreshing {from_city} to {to_city}: {e}")
         
         print("✅ Force refresh completed") 
\ No newline at end of file
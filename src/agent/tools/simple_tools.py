@@ -3,10 +3,18 @@ Single-input wrapper tools for LangChain agent compatibility
 These tools accept a single string input and parse the parameters
 """
 
+import re
 from langchain.tools import tool
 from .databaseTools import _save_flight_search_impl, _get_flight_searches_impl
 from .tavily_price_tracker import tavily_price_tracker
 
+# Single-pass parsers for the comma-separated tool inputs. Fields may be empty and may
+# contain newlines; each group is the field with surrounding whitespace removed, and
+# fields past the ones a tool uses are ignored (same as split(',') + strip()).
+_SAVE_RE = re.compile(r'\s*(?P<dest>[^,]*?)\s*,\s*(?P<orig>[^,]*?)\s*,\s*(?P<price>[^,]*?)\s*(?:,\s*(?P<uid>[^,]*?)\s*(?:,.*)?)?', re.DOTALL)
+_SEARCHES_RE = re.compile(r'\s*(?P<uid>[^,]*?)\s*(?:,\s*(?P<limit>[^,]*?)\s*(?:,.*)?)?', re.DOTALL)
+_SEARCH_RE = re.compile(r'\s*(?P<orig>[^,]*?)\s*,\s*(?P<dest>[^,]*?)\s*,\s*(?P<price>[^,]*?)\s*(?:,.*)?', re.DOTALL)
+
 @tool
 def save_flight_search_simple(input_string: str) -> str:
     """
@@ -20,16 +28,14 @@ def save_flight_search_simple(input_string: str) -> str:
         Success message with document ID or error message
     """
     try:
-        parts = input_string.split(',')
-        if len(parts) < 3:
+        m = _SAVE_RE.fullmatch(input_string)
+        if not m:
             return "❌ Error: Please provide at least destination,origin,max_price (comma-separated)"
         
-        to_destination = parts[0].strip()
-        from_origin = parts[1].strip()
-        max_price = int(parts[2].strip())
-        user_id = parts[3].strip() if len(parts) > 3 else "default"
+        max_price = int(m['price'])
+        user_id = m['uid'] if m['uid'] is not None else "default"
         
-        return _save_flight_search_impl(to_destination, from_origin, max_price, user_id)
+        return _save_flight_search_impl(m['dest'], m['orig'], max_price, user_id)
     except ValueError:
         return "❌ Error: max_price must be a valid number"
     except Exception as e:
@@ -48,9 +54,9 @@ def get_flight_searches_simple(input_string: str) -> str:
         JSON string of flight searches or error message
     """
     try:
-        parts = input_string.split(',')
-        user_id = parts[0].strip() if parts[0].strip() else "default"
-        limit = int(parts[1].strip()) if len(parts) > 1 and parts[1].strip() else 10
+        m = _SEARCHES_RE.fullmatch(input_string)  # Always matches: every field is optional
+        user_id = m['uid'] or "default"
+        limit = int(m['limit']) if m['limit'] else 10
         
         return _get_flight_searches_impl(user_id, limit)
     except ValueError:
@@ -71,20 +77,14 @@ def search_flight_prices_simple(input_string: str) -> str:
         Flight price information from Tavily API
     """
     try:
-        parts = input_string.split(',')
-        if len(parts) < 3:
+        m = _SEARCH_RE.fullmatch(input_string)
+        if not m:
             return "❌ Error: Please provide from_city,to_city,max_price (comma-separated)"
         
-        from_city = parts[0].strip()
-        to_city = parts[1].strip()
-        max_price = parts[2].strip()
-        
         return tavily_price_tracker.invoke({
-            "from_city": from_city,
-            "to_city": to_city,
-            "max_price": max_price
+            "from_city": m['orig'],
+            "to_city": m['dest'],
+            "max_price": m['price']
         })
-
-        return 
-    except Exception as e:
+    except (IndexError, KeyError, ValueError) as e:
         return f"❌ Error searching flights: {str(e)}"
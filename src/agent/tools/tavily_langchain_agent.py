@@ -6,9 +6,10 @@ to provide intelligent flight price monitoring with CLI interface.
 """
 
 import asyncio
+import functools
 import os
+import re
 import sys
-import json
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional, Any
@@ -19,19 +20,87 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.append(str(project_root))
 
 from langchain.agents import AgentExecutor, create_openai_functions_agent
-from langchain.schema import SystemMessage, HumanMessage
+from langchain.schema import SystemMessage, HumanMessage, AIMessage
 from langchain_openai import ChatOpenAI
 from langchain.tools import tool
 from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
 from dotenv import load_dotenv
+import orjson
 
 # Import our custom tools
-from agent.tools.tavily_price_tracker import tavily_price_tracker
+from agent.tools.tavily_price_tracker import (
+    tavily_price_tracker,
+    flight_data_path,
+    read_recent_searches,
+    load_recent_searches,
+    load_price_summary,
+    search_average_prices,
+    aclose_http_session
+)
 from agent.real_time_data_manager import RealTimeDataManager
 
 # Load environment variables
 load_dotenv()
 
+# Data directories, created once at import instead of on every tool call
+_DATA_DIR = Path("data")
+_MONITORING_DIR = _DATA_DIR / "monitoring"
+_ALERTS_DIR = _DATA_DIR / "alerts"
+_MONITORING_DIR.mkdir(parents=True, exist_ok=True)
+_ALERTS_DIR.mkdir(parents=True, exist_ok=True)
+
+# Upper bound on concurrent Tavily searches during route fan-out (rate limits)
+MAX_CONCURRENT_SEARCHES = 8
+
+# Number of most recent searches read for trend analysis (older ones come from the summary)
+TREND_WINDOW = 50
+
+# Chat history compaction
+HISTORY_KEEP_TURNS = 4  # Most recent turns kept verbatim
+HISTORY_MAX_MESSAGE_CHARS = 200  # Older messages longer than this are condensed to one line
+HISTORY_SUMMARIZE_EVERY = 10  # Turns between LLM summaries of the older history
+HISTORY_TOKEN_BUDGET = 2000  # Estimated tokens allowed for the whole history
+
+# Plain "find flights from X to Y [under $N]" requests, answered without an LLM round trip
+_FAST_PATH_RE = re.compile(
+    r'\s*find (?:me )?flights? from (\w+(?: \w+)?) to (\w+(?: \w+)?)(?: under \$?(\d+))?\s*[.!?]?\s*',
+    re.IGNORECASE
+)
+
+# LLM settings for the agent
+AGENT_MODEL = "gpt-3.5-turbo"
+AGENT_TEMPERATURE = 0.1
+
+# Prompt shared by every agent instance
+SYSTEM_PROMPT = """You are an intelligent flight price monitoring assistant powered by Tavily web crawling.
+
+Your capabilities:
+1. Search for flight prices using real-time web data via Tavily API
+2. Monitor multiple flight routes simultaneously
+3. Set price alerts and thresholds
+4. Provide detailed price analysis and recommendations
+5. Save and manage flight data locally
+
+When users ask about flights, always:
+- Use the tavily_search_flights tool to get current prices
+- Use tavily_search_flights_batch to search several routes in one call when comparing routes
+- Provide clear, actionable information
+- Suggest price thresholds based on market data
+- Offer to set up monitoring for good deals
+
+Be helpful, accurate, and proactive in suggesting money-saving opportunities."""
+
+PROMPT = ChatPromptTemplate.from_messages([
+    ("system", SYSTEM_PROMPT),
+    MessagesPlaceholder(variable_name="chat_history"),
+    ("human", "{input}"),
+    MessagesPlaceholder(variable_name="agent_scratchpad")
+])
+
+def _estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token) to avoid running a tokenizer every turn."""
+    return len(text) // 4
+
 class TavilyLangChainAgent:
     """
     Advanced LangChain agent that uses Tavily web crawling for intelligent
@@ -49,14 +118,10 @@ class TavilyLangChainAgent:
             raise ValueError("Tavily API key is required")
         
         # Initialize components
-        self.data_manager = RealTimeDataManager(data_dir="data", refresh_interval=300)
-        self.llm = ChatOpenAI(
-            api_key=self.openai_api_key,
-            model="gpt-3.5-turbo",
-            temperature=0.1
-        )
+        self.data_manager = RealTimeDataManager(data_dir=_DATA_DIR, refresh_interval=300)
         
         # Initialize agent
+        self.llm = None
         self.agent_executor = None
         self._setup_agent()
         
@@ -66,53 +131,12 @@ class TavilyLangChainAgent:
         self.current_routes = []
         
     def _setup_agent(self):
-        """Set up the LangChain agent with tools and prompts."""
-        
-        # Define the system prompt
-        system_prompt = """You are an intelligent flight price monitoring assistant powered by Tavily web crawling.
-
-Your capabilities:
-1. Search for flight prices using real-time web data via Tavily API
-2. Monitor multiple flight routes simultaneously
-3. Set price alerts and thresholds
-4. Provide detailed price analysis and recommendations
-5. Save and manage flight data locally
-
-When users ask about flights, always:
-- Use the tavily_search_flights tool to get current prices
-- Provide clear, actionable information
-- Suggest price thresholds based on market data
-- Offer to set up monitoring for good deals
-
-Be helpful, accurate, and proactive in suggesting money-saving opportunities."""
-
-        # Create the prompt template
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", system_prompt),
-            MessagesPlaceholder(variable_name="chat_history"),
-            ("human", "{input}"),
-            MessagesPlaceholder(variable_name="agent_scratchpad")
-        ])
-        
-        # Create agent with tools
-        tools = [
-            tavily_search_flights,
-            start_flight_monitoring,
-            stop_flight_monitoring,
-            get_saved_flight_data,
-            analyze_price_trends,
-            set_price_alert
-        ]
-        
-        agent = create_openai_functions_agent(
-            llm=self.llm,
-            tools=tools,
-            prompt=prompt
-        )
+        """Wrap the shared LangChain agent in an executor for this instance."""
+        self.llm, agent = _build_agent(self.openai_api_key, AGENT_MODEL, AGENT_TEMPERATURE)
         
         self.agent_executor = AgentExecutor(
             agent=agent,
-            tools=tools,
+            tools=list(TOOLS),
             verbose=True,
             return_intermediate_steps=True,
             max_iterations=5
@@ -132,6 +156,46 @@ Be helpful, accurate, and proactive in suggesting money-saving opportunities."""
         except Exception as e:
             return f"I encountered an error: {str(e)}. Please try rephrasing your request."
     
+    async def _compact_history(self, chat_history: List, turn: int) -> List:
+        """
+        Shrink the chat history sent with every request.
+        
+        The last HISTORY_KEEP_TURNS turns are kept verbatim. Older long messages are cut to
+        their first line, every HISTORY_SUMMARIZE_EVERY turns the older messages are replaced by
+        an LLM-written summary, and the oldest messages are dropped if the history is still
+        over HISTORY_TOKEN_BUDGET.
+        """
+        keep = HISTORY_KEEP_TURNS * 2
+        older, recent = chat_history[:-keep], chat_history[-keep:]
+        if not older:
+            return chat_history
+        
+        if turn % HISTORY_SUMMARIZE_EVERY == 0:
+            transcript = "\n".join(f"{message.type}: {message.content}" for message in older)
+            try:
+                summary = await self.llm.ainvoke([
+                    SystemMessage(content="Summarize this conversation in a few sentences. Keep cities, prices, thresholds and monitored routes."),
+                    HumanMessage(content=transcript)
+                ])
+                older = [SystemMessage(content=f"Summary of the earlier conversation: {summary.content}")]
+            except Exception as e:
+                print(f"⚠️  Could not summarize chat history: {e}")
+        
+        condensed = []
+        for message in older:
+            content = message.content
+            if isinstance(message, AIMessage) and len(content) > HISTORY_MAX_MESSAGE_CHARS:
+                first_line = content.strip().split("\n", 1)[0]
+                message = AIMessage(content=first_line[:HISTORY_MAX_MESSAGE_CHARS] + " …")
+            condensed.append(message)
+        
+        # Drop the oldest messages while over the token budget
+        tokens = sum(_estimate_tokens(message.content) for message in condensed + recent)
+        while condensed and tokens > HISTORY_TOKEN_BUDGET:
+            tokens -= _estimate_tokens(condensed.pop(0).content)
+        
+        return condensed + recent
+    
     async def start_cli(self):
         """Start the interactive CLI interface."""
         print("🤖 Tavily-LangChain Flight Price Agent")
@@ -141,6 +205,7 @@ Be helpful, accurate, and proactive in suggesting money-saving opportunities."""
         print()
         
         chat_history = []
+        turn = 0
         
         while True:
             try:
@@ -158,16 +223,21 @@ Be helpful, accurate, and proactive in suggesting money-saving opportunities."""
                     continue
                 
                 print("🤖 Agent: ", end="", flush=True)
-                response = await self.chat(user_input, chat_history)
+                fast_path = _FAST_PATH_RE.fullmatch(user_input)
+                if fast_path:
+                    from_city, to_city, max_price = fast_path.groups()
+                    response = await _search_flights(from_city.strip(), to_city.strip(), max_price or "1000")
+                else:
+                    response = await self.chat(user_input, chat_history)
                 print(response)
                 
                 # Update chat history
                 chat_history.append(HumanMessage(content=user_input))
-                chat_history.append({"role": "assistant", "content": response})
+                chat_history.append(AIMessage(content=response))
                 
                 # Keep history manageable
-                if len(chat_history) > 10:
-                    chat_history = chat_history[-8:]
+                turn += 1
+                chat_history = await self._compact_history(chat_history, turn)
                 
             except KeyboardInterrupt:
                 print("\n👋 Goodbye! Safe travels!")
@@ -202,23 +272,22 @@ General:
         """
         print(help_text)
 
-# LangChain Tools for the Agent
+# Helpers shared by the agent tools
 
-@tool
-async def tavily_search_flights(from_city: str, to_city: str, max_price: str = "1000") -> str:
-    """
-    Search for flight prices using Tavily web crawling.
+async def _gather_limited(coros, limit: int = MAX_CONCURRENT_SEARCHES) -> List:
+    """Run coroutines concurrently with at most `limit` of them in flight."""
+    semaphore = asyncio.Semaphore(limit)
     
-    Args:
-        from_city: Origin city
-        to_city: Destination city  
-        max_price: Maximum price threshold (default: 1000)
+    async def run(coro):
+        async with semaphore:
+            return await coro
     
-    Returns:
-        Formatted flight price information
-    """
+    return await asyncio.gather(*(run(coro) for coro in coros))
+
+async def _search_flights(from_city: str, to_city: str, max_price: str = "1000") -> str:
+    """Search a single route via the Tavily price tracker."""
     try:
-        result = tavily_price_tracker.invoke({
+        result = await tavily_price_tracker.ainvoke({
             "from_city": from_city,
             "to_city": to_city,
             "max_price": max_price
@@ -227,23 +296,27 @@ async def tavily_search_flights(from_city: str, to_city: str, max_price: str = "
     except Exception as e:
         return f"Error searching flights: {str(e)}"
 
-@tool
-async def start_flight_monitoring(from_city: str, to_city: str, threshold: str = "500") -> str:
+def _write_json(path: Path, data: dict):
+    """Write a config dict to disk as indented JSON."""
+    with open(path, 'wb') as f:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+
+async def _write_with_status(path: Path, data: dict, from_city: str, to_city: str, max_price: str, include_current: bool) -> Optional[str]:
     """
-    Start monitoring a flight route for price drops.
-    
-    Args:
-        from_city: Origin city
-        to_city: Destination city
-        threshold: Price threshold for alerts
-    
-    Returns:
-        Confirmation message
+    Write a config file, fetching the route's current prices concurrently if requested.
+    Repeat searches are answered from the price tracker's cache without an API call.
     """
+    write = asyncio.to_thread(_write_json, path, data)
+    if not include_current:
+        await write
+        return None
+    
+    _, current_result = await asyncio.gather(write, _search_flights(from_city, to_city, max_price))
+    return current_result
+
+async def _start_monitoring(from_city: str, to_city: str, threshold: str = "500", include_current: bool = True) -> str:
+    """Save the monitoring config for a route and optionally report its current prices."""
     try:
-        # First get current prices
-        current_result = await tavily_search_flights(from_city, to_city, threshold)
-        
         # Save monitoring configuration
         config = {
             "route": f"{from_city} to {to_city}",
@@ -253,18 +326,127 @@ async def start_flight_monitoring(from_city: str, to_city: str, threshold: str =
         }
         
         # Save to monitoring config file
-        config_dir = Path("data/monitoring")
-        config_dir.mkdir(parents=True, exist_ok=True)
-        
-        config_file = config_dir / f"monitor_{from_city}_{to_city}.json"
-        with open(config_file, 'w') as f:
-            json.dump(config, f, indent=2)
+        config_file = _MONITORING_DIR / f"monitor_{from_city}_{to_city}.json"
+        current_result = await _write_with_status(config_file, config, from_city, to_city, threshold, include_current)
         
-        return f"✅ Started monitoring {from_city} to {to_city} flights. Will alert when prices drop below ${threshold}.\n\nCurrent status:\n{current_result}"
+        result = f"✅ Started monitoring {from_city} to {to_city} flights. Will alert when prices drop below ${threshold}."
+        if current_result is not None:
+            result += f"\n\nCurrent status:\n{current_result}"
+        return result
         
     except Exception as e:
         return f"Error starting monitoring: {str(e)}"
 
+def _scan_files(directory: Path, prefix: str, suffix: str) -> List[Path]:
+    """List files in a directory by name in one scandir pass (no per-entry stat)."""
+    try:
+        with os.scandir(directory) as entries:
+            return [
+                Path(entry.path) for entry in entries
+                if entry.name.startswith(prefix) and entry.name.endswith(suffix) and entry.is_file()
+            ]
+    except FileNotFoundError:
+        return []
+
+def _remove_all_monitors() -> int:
+    """Delete every monitoring config file and return how many were removed."""
+    count = 0
+    for config_file in _scan_files(_MONITORING_DIR, "monitor_", ".json"):
+        os.unlink(config_file)
+        count += 1
+    return count
+
+async def _read_route_summary(file_path: Path) -> str:
+    """Read a saved flight price file and format a one-line route summary."""
+    filename = file_path.stem
+    route = filename.replace("flight_prices_", "").replace("_", " to ")
+    
+    try:
+        searches = await asyncio.to_thread(read_recent_searches, file_path, 1)
+        
+        if searches:
+            latest_search = searches[-1]
+            flight_count = len(latest_search.get("flights", []))
+            timestamp = latest_search.get("search_timestamp", "Unknown")
+            return f"• {route}: {flight_count} flights (updated: {timestamp[:10]})\n"
+        return ""
+        
+    except Exception as e:
+        return f"• {route}: Error reading data\n"
+
+# LangChain Tools for the Agent
+
+@tool
+async def tavily_search_flights(from_city: str, to_city: str, max_price: str = "1000") -> str:
+    """
+    Search for flight prices using Tavily web crawling.
+    
+    Args:
+        from_city: Origin city
+        to_city: Destination city  
+        max_price: Maximum price threshold (default: 1000)
+    
+    Returns:
+        Formatted flight price information
+    """
+    return await _search_flights(from_city, to_city, max_price)
+
+@tool
+async def tavily_search_flights_batch(routes: List[Dict[str, str]]) -> str:
+    """
+    Search flight prices for several routes at once. Routes are searched concurrently.
+    
+    Args:
+        routes: List of routes, each with "from_city", "to_city" and optional "max_price" (default: 1000)
+    
+    Returns:
+        Formatted flight price information for each route
+    """
+    if not routes:
+        return "No routes provided."
+    
+    results = await _gather_limited(
+        _search_flights(route.get("from_city", ""), route.get("to_city", ""), route.get("max_price", "1000"))
+        for route in routes
+    )
+    return "\n\n".join(results)
+
+@tool
+async def start_flight_monitoring(from_city: str, to_city: str, threshold: str = "500", include_current: bool = True) -> str:
+    """
+    Start monitoring a flight route for price drops.
+    
+    Args:
+        from_city: Origin city
+        to_city: Destination city
+        threshold: Price threshold for alerts
+        include_current: Also report current prices for the route (default: True)
+    
+    Returns:
+        Confirmation message
+    """
+    return await _start_monitoring(from_city, to_city, threshold, include_current)
+
+@tool
+async def start_multiple_monitors(routes: List[Dict[str, str]]) -> str:
+    """
+    Start monitoring several flight routes at once. Routes are searched concurrently.
+    
+    Args:
+        routes: List of routes, each with "from_city", "to_city" and optional "threshold" (default: 500)
+    
+    Returns:
+        Confirmation message for each route
+    """
+    if not routes:
+        return "No routes provided."
+    
+    results = await _gather_limited(
+        _start_monitoring(route.get("from_city", ""), route.get("to_city", ""), route.get("threshold", "500"))
+        for route in routes
+    )
+    return "\n\n".join(results)
+
 @tool
 async def stop_flight_monitoring(from_city: str = "", to_city: str = "") -> str:
     """
@@ -278,24 +460,17 @@ async def stop_flight_monitoring(from_city: str = "", to_city: str = "") -> str:
         Confirmation message
     """
     try:
-        config_dir = Path("data/monitoring")
-        if not config_dir.exists():
-            return "No active monitoring found."
-        
         if from_city and to_city:
             # Stop specific route
-            config_file = config_dir / f"monitor_{from_city}_{to_city}.json"
-            if config_file.exists():
+            config_file = _MONITORING_DIR / f"monitor_{from_city}_{to_city}.json"
+            try:
                 config_file.unlink()
                 return f"✅ Stopped monitoring {from_city} to {to_city} flights."
-            else:
+            except FileNotFoundError:
                 return f"No monitoring found for {from_city} to {to_city}."
         else:
             # Stop all monitoring
-            count = 0
-            for config_file in config_dir.glob("monitor_*.json"):
-                config_file.unlink()
-                count += 1
+            count = await asyncio.to_thread(_remove_all_monitors)
             
             if count > 0:
                 return f"✅ Stopped monitoring {count} flight route(s)."
@@ -318,23 +493,17 @@ async def get_saved_flight_data(from_city: str = "", to_city: str = "") -> str:
         Formatted flight data summary
     """
     try:
-        data_dir = Path("data")
-        if not data_dir.exists():
-            return "No saved flight data found."
-        
         if from_city and to_city:
             # Get specific route data
-            data_file = data_dir / f"flight_prices_{from_city}_{to_city}.json"
+            data_file = Path(flight_data_path(from_city, to_city))
             if not data_file.exists():
                 return f"No saved data found for {from_city} to {to_city}."
             
-            with open(data_file, 'r') as f:
-                data = json.load(f)
-            
-            if not data.get("searches"):
+            searches = await asyncio.to_thread(read_recent_searches, data_file, 1)
+            if not searches:
                 return f"No flight searches found for {from_city} to {to_city}."
             
-            latest_search = data["searches"][-1]
+            latest_search = searches[-1]
             flights = latest_search.get("flights", [])
             
             if not flights:
@@ -352,28 +521,15 @@ async def get_saved_flight_data(from_city: str = "", to_city: str = "") -> str:
             return result
         else:
             # Get all saved data summary
-            flight_files = list(data_dir.glob("flight_prices_*.json"))
+            flight_files = await asyncio.to_thread(_scan_files, _DATA_DIR, "flight_prices_", ".jsonl")
             if not flight_files:
                 return "No saved flight data found."
             
             result = f"📊 Saved Flight Data Summary ({len(flight_files)} routes):\n\n"
             
-            for file_path in flight_files[:10]:  # Show up to 10 routes
-                try:
-                    filename = file_path.stem
-                    route = filename.replace("flight_prices_", "").replace("_", " to ")
-                    
-                    with open(file_path, 'r') as f:
-                        data = json.load(f)
-                    
-                    if data.get("searches"):
-                        latest_search = data["searches"][-1]
-                        flight_count = len(latest_search.get("flights", []))
-                        timestamp = latest_search.get("search_timestamp", "Unknown")
-                        result += f"• {route}: {flight_count} flights (updated: {timestamp[:10]})\n"
-                    
-                except Exception as e:
-                    result += f"• {route}: Error reading data\n"
+            # Read up to 10 routes concurrently
+            summaries = await asyncio.gather(*[_read_route_summary(p) for p in flight_files[:10]])
+            result += "".join(summaries)
             
             return result
             
@@ -393,37 +549,30 @@ async def analyze_price_trends(from_city: str, to_city: str) -> str:
         Price trend analysis
     """
     try:
-        data_file = Path(f"data/flight_prices_{from_city}_{to_city}.json")
+        data_file = Path(flight_data_path(from_city, to_city))
         if not data_file.exists():
             return f"No historical data found for {from_city} to {to_city}. Search for flights first to build price history."
         
-        with open(data_file, 'r') as f:
-            data = json.load(f)
-        
-        searches = data.get("searches", [])
-        if len(searches) < 2:
-            return f"Need more historical data for trend analysis. Only {len(searches)} search(es) found."
-        
-        # Analyze trends
-        prices = []
-        dates = []
+        # Whole-history stats come from the summary sidecar, only the recent window is parsed
+        summary = await asyncio.to_thread(load_price_summary, from_city, to_city)
+        if summary["searches"] < 2:
+            return f"Need more historical data for trend analysis. Only {summary['searches']} search(es) found."
         
-        for search in searches:
-            flights = search.get("flights", [])
-            if flights:
-                # Get average price for this search
-                valid_prices = [float(f.get("price", 0)) for f in flights if f.get("price")]
-                if valid_prices:
-                    avg_price = sum(valid_prices) / len(valid_prices)
-                    prices.append(avg_price)
-                    dates.append(search.get("search_timestamp", ""))
-        
-        if len(prices) < 2:
+        count = summary["count"]
+        if count < 2:
             return "Insufficient price data for trend analysis."
         
+        searches = await asyncio.to_thread(load_recent_searches, from_city, to_city, TREND_WINDOW)
+        prices = search_average_prices(searches)
+        if prices.size < min(count, 3):
+            # Recent searches had no prices, fall back to the full history
+            searches = await asyncio.to_thread(load_recent_searches, from_city, to_city, None)
+            prices = search_average_prices(searches)
+        
         # Calculate trend
-        recent_avg = sum(prices[-3:]) / len(prices[-3:]) if len(prices) >= 3 else prices[-1]
-        older_avg = sum(prices[:-3]) / len(prices[:-3]) if len(prices) > 3 else prices[0]
+        recent_prices = prices[-3:]
+        recent_avg = recent_prices.mean() if count >= 3 else prices[-1]
+        older_avg = (summary["sum"] - recent_prices.sum()) / (count - 3) if count > 3 else prices[0]
         
         trend = "stable"
         if recent_avg < older_avg * 0.9:
@@ -431,12 +580,12 @@ async def analyze_price_trends(from_city: str, to_city: str) -> str:
         elif recent_avg > older_avg * 1.1:
             trend = "increasing"
         
-        min_price = min(prices)
-        max_price = max(prices)
+        min_price = summary["min"]
+        max_price = summary["max"]
         current_price = prices[-1]
         
         result = f"📈 Price Trend Analysis for {from_city} to {to_city}:\n\n"
-        result += f"📊 Data points: {len(prices)} searches\n"
+        result += f"📊 Data points: {count} searches\n"
         result += f"💰 Current average: ${current_price:.2f}\n"
         result += f"📉 Lowest seen: ${min_price:.2f}\n"
         result += f"📈 Highest seen: ${max_price:.2f}\n"
@@ -455,7 +604,7 @@ async def analyze_price_trends(from_city: str, to_city: str) -> str:
         return f"Error analyzing price trends: {str(e)}"
 
 @tool
-async def set_price_alert(from_city: str, to_city: str, target_price: str) -> str:
+async def set_price_alert(from_city: str, to_city: str, target_price: str, include_current: bool = True) -> str:
     """
     Set a price alert for a specific route.
     
@@ -463,6 +612,7 @@ async def set_price_alert(from_city: str, to_city: str, target_price: str) -> st
         from_city: Origin city
         to_city: Destination city
         target_price: Target price for alert
+        include_current: Also report current prices for the route (default: True)
     
     Returns:
         Confirmation message
@@ -480,19 +630,13 @@ async def set_price_alert(from_city: str, to_city: str, target_price: str) -> st
         }
         
         # Save alert
-        alerts_dir = Path("data/alerts")
-        alerts_dir.mkdir(parents=True, exist_ok=True)
-        
-        alert_file = alerts_dir / f"alert_{from_city}_{to_city}_{target}.json"
-        with open(alert_file, 'w') as f:
-            json.dump(alert_config, f, indent=2)
-        
-        # Get current prices to compare
-        current_result = await tavily_search_flights(from_city, to_city, str(int(target * 1.5)))
+        alert_file = _ALERTS_DIR / f"alert_{from_city}_{to_city}_{target}.json"
+        current_result = await _write_with_status(alert_file, alert_config, from_city, to_city, str(int(target * 1.5)), include_current)
         
         result = f"🔔 Price alert set for {from_city} to {to_city} at ${target}!\n\n"
-        result += f"I'll notify you when flights drop to ${target} or below.\n\n"
-        result += f"Current market status:\n{current_result}"
+        result += f"I'll notify you when flights drop to ${target} or below."
+        if current_result is not None:
+            result += f"\n\nCurrent market status:\n{current_result}"
         
         return result
         
@@ -501,6 +645,33 @@ async def set_price_alert(from_city: str, to_city: str, target_price: str) -> st
     except Exception as e:
         return f"Error setting price alert: {str(e)}"
 
+# Tools available to the agent
+TOOLS = (
+    tavily_search_flights,
+    tavily_search_flights_batch,
+    start_flight_monitoring,
+    start_multiple_monitors,
+    stop_flight_monitoring,
+    get_saved_flight_data,
+    analyze_price_trends,
+    set_price_alert
+)
+
+@functools.lru_cache(maxsize=4)
+def _build_agent(openai_api_key: str, model: str, temperature: float):
+    """Build the LLM and OpenAI functions agent once per (key, model, temperature) and share them."""
+    llm = ChatOpenAI(
+        api_key=openai_api_key,
+        model=model,
+        temperature=temperature
+    )
+    agent = create_openai_functions_agent(
+        llm=llm,
+        tools=list(TOOLS),
+        prompt=PROMPT
+    )
+    return llm, agent
+
 async def main():
     """Main CLI entry point."""
     parser = argparse.ArgumentParser(description="Tavily-LangChain Flight Price Agent")
@@ -542,6 +713,9 @@ async def main():
     except Exception as e:
         print(f"❌ Error: {e}")
         sys.exit(1)
+    finally:
+        # The tracker's shared HTTP session is closed here, once, before the loop exits
+        await aclose_http_session()
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -1,18 +1,108 @@
+import asyncio
+import hashlib
 import os
 import requests
-import json
-import re
-import os
-import requests
-import json
+from requests.adapters import HTTPAdapter
 import re
+import ssl
+import threading
+import time
+from collections import deque
 from datetime import datetime
-from langchain.tools import tool
+import aiohttp
+import certifi
+import ijson
+import numpy as np
+import orjson
+from langchain.tools import StructuredTool
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+# In-process cache of tool results: key -> (expires_at, result)
+CACHE_TTL = 600  # Successful Tavily results (seconds)
+BACKUP_CACHE_TTL = 30  # Backup results after rate limits/timeouts (seconds)
+_result_cache = {}
+_result_cache_lock = threading.Lock()
+
+# Price patterns: $123.45, CAD 123.45, 123.45 CAD (combined for a single pass)
+_PRICE_RE = re.compile(r'\$(\d+(?:\.\d{2})?)|CAD\s*(\d+(?:\.\d{2})?)|(\d+(?:\.\d{2})?)\s*CAD', re.IGNORECASE)
+MAX_FLIGHTS = 5  # Flights kept per search
+
+# Local flight price history, one flight_prices_{from}_{to}.jsonl file per route
+DATA_DIR = "data"
+os.makedirs(DATA_DIR, exist_ok=True)
+
+# Searches kept in a route's history file; older ones are moved to ARCHIVE_DIR
+MAX_HISTORY = int(os.getenv("FLIGHT_HISTORY_MAX", "500"))
+if MAX_HISTORY < 1:
+    raise ValueError(f"FLIGHT_HISTORY_MAX must be at least 1 (got {MAX_HISTORY}). Please update it in your .env file.")
+ARCHIVE_DIR = f"{DATA_DIR}/archive"
+
+# Tavily API endpoint
+TAVILY_SEARCH_URL = "https://api.tavily.com/search"
+
+# Search options: basic depth and no raw page content keep responses small, since only
+# the answer and result snippets are parsed (set TAVILY_INCLUDE_RAW_CONTENT=true to get pages)
+TAVILY_SEARCH_DEPTH = os.getenv("TAVILY_SEARCH_DEPTH", "basic")
+TAVILY_MAX_RESULTS = int(os.getenv("TAVILY_MAX_RESULTS", "5"))
+TAVILY_INCLUDE_RAW_CONTENT = os.getenv("TAVILY_INCLUDE_RAW_CONTENT", "false").lower() == "true"
+
+# Backup data used when the Tavily API is unavailable
+_RNG = np.random.default_rng()
+_AIRLINES = ("Air Canada", "WestJet", "Porter Airlines", "Delta", "United", "American Airlines")
+_TIMES = ("8:30 AM", "12:45 PM", "4:20 PM", "7:15 PM", "9:50 AM", "2:30 PM")
+BACKUP_FLIGHT_COUNT = 3
+
+# API key and request headers, read once at import (None if the key is not set)
+_API_KEY = os.getenv("TAVILY_API_KEY")
+_HEADERS = {
+    "Authorization": f"Bearer {_API_KEY}",
+    "Content-Type": "application/json"
+} if _API_KEY else None
+
+# Connection pool sizes shared by the sync and async HTTP clients
+POOL_CONNECTIONS = 16  # Keep-alive connections per host
+POOL_MAXSIZE = 32  # Maximum open connections
+
+# Shared requests session for sync searches, reusing TCP/TLS connections to Tavily
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE))
+
+# Shared aiohttp session for async searches (created lazily per event loop)
+_http_session = None
+_http_session_loop = None
+
+# Async searches currently running: key -> Task, shared by concurrent identical calls
+_inflight = {}
+
+def _cache_key(from_city: str, to_city: str, max_price: int) -> str:
+    """Build a normalized cache key for a route search."""
+    return f"{from_city.lower().strip()}|{to_city.lower().strip()}|{max_price}"
+
+def _cache_get(key: str):
+    """Return a cached result if it has not expired, else None."""
+    with _result_cache_lock:
+        entry = _result_cache.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.time():
+            del _result_cache[key]
+            return None
+        return entry[1]
+
+def _cache_put(key: str, result: str, ttl: int) -> str:
+    """Store a result in the cache and return it."""
+    with _result_cache_lock:
+        _result_cache[key] = (time.time() + ttl, result)
+    return result
+
+def invalidate_cached_search(from_city: str, to_city: str, max_price):
+    """Drop a route's cached result so the next search hits the API (used by scheduled refreshes)."""
+    with _result_cache_lock:
+        _result_cache.pop(_cache_key(from_city, to_city, int(max_price)), None)
+
 def parse_flight_data(raw_data: dict, max_price: int) -> list:
     """
     Parse flight price data from Tavily API response
@@ -41,45 +131,245 @@ def parse_flight_data(raw_data: dict, max_price: int) -> list:
         if not content:
             return flights
         
-        # Look for price patterns in the content
-        # Common patterns: $XXX, CAD XXX, etc.
-        price_patterns = [
-            r'\$(\d+(?:\.\d{2})?)',  # $123.45
-            r'CAD\s*(\d+(?:\.\d{2})?)',  # CAD 123.45
-            r'(\d+(?:\.\d{2})?)\s*CAD',  # 123.45 CAD
-        ]
+        return _flights_from_prices(_scan_prices(content, max_price))
         
-        # Extract all prices from content
-        all_prices = []
-        for pattern in price_patterns:
-            matches = re.findall(pattern, content, re.IGNORECASE)
-            all_prices.extend([float(price) for price in matches])
+    except Exception as e:
+        print(f"Error parsing flight data: {e}")
+        return flights
+
+def _scan_prices(text: str, max_price: int, limit: int = MAX_FLIGHTS) -> list:
+    """Scan text once for prices within budget, stopping as soon as `limit` are found."""
+    valid_prices = []
+    for match in _PRICE_RE.finditer(text):
+        price = float(next(group for group in match.groups() if group))
+        if price <= max_price:
+            valid_prices.append(price)
+            if len(valid_prices) == limit:
+                break
+    return valid_prices
+
+def _flights_from_prices(prices: list) -> list:
+    """Create flight entries for each valid price."""
+    flights = []
+    for price in prices:
+        flight = {
+            "price": price,
+            "airline": "Multiple Airlines",  # Placeholder - would need more parsing
+            "departure": "Various Times",    # Placeholder
+            "destination": "Flight Route",   # Placeholder
+            "timestamp": datetime.now().isoformat(),
+            "source": "Tavily Web Crawl"
+        }
+        flights.append(flight)
+    return flights
+
+class _StreamingPriceScanner:
+    """
+    Scan ijson parse events of a Tavily response for prices as the body arrives
+    
+    Follows parse_flight_data: a top-level content/answer field is used on its own,
+    otherwise the content of every result. Tavily sends the answer before the results,
+    so reading can stop after the answer or once MAX_FLIGHTS result prices are found.
+    """
+    
+    def __init__(self, max_price: int):
+        self.max_price = max_price
+        self.direct_prices = None
+        self.result_prices = []
+    
+    def feed(self, prefix: str, event: str, value) -> bool:
+        """Process one parse event, returning True once the rest of the body is not needed."""
+        if prefix in ("content", "answer") and event in ("string", "null"):
+            self.direct_prices = _scan_prices(value, self.max_price) if value else []
+            return True
         
-        # Filter prices within budget
-        valid_prices = [price for price in all_prices if price <= max_price]
+        if prefix == "results.item.content" and event == "string":
+            remaining = MAX_FLIGHTS - len(self.result_prices)
+            self.result_prices.extend(_scan_prices(value, self.max_price, remaining))
+            return len(self.result_prices) == MAX_FLIGHTS
         
-        if valid_prices:
-            # Create flight entries for each valid price
-            for i, price in enumerate(valid_prices[:5]):  # Limit to 5 results
-                flight = {
-                    "price": price,
-                    "airline": "Multiple Airlines",  # Placeholder - would need more parsing
-                    "departure": "Various Times",    # Placeholder
-                    "destination": "Flight Route",   # Placeholder
-                    "timestamp": datetime.now().isoformat(),
-                    "source": "Tavily Web Crawl"
-                }
-                flights.append(flight)
+        return False
+    
+    def flights(self) -> list:
+        """Build flight entries from the prices found so far."""
+        prices = self.direct_prices if self.direct_prices is not None else self.result_prices
+        return _flights_from_prices(prices)
+
+def flight_data_path(from_city: str, to_city: str) -> str:
+    """
+    Get the JSON Lines history file for a route (one search per line)
+    
+    Args:
+        from_city (str): Origin city
+        to_city (str): Destination city
+    
+    Returns:
+        str: Path to the route's history file
+    """
+    return f"{DATA_DIR}/flight_prices_{from_city}_{to_city}.jsonl"
+
+def _migrate_legacy_flight_data(filename: str):
+    """
+    Convert a pre-JSONL flight_prices_{from}_{to}.json file into the JSON Lines format
+    
+    Args:
+        filename (str): Path of the JSON Lines file to create (the legacy file sits beside it as .json)
+    """
+    filename = str(filename)
+    if not filename.endswith(".jsonl"):
+        return
+    legacy_filename = filename[:-len(".jsonl")] + ".json"
+    if not os.path.exists(legacy_filename) or os.path.exists(filename):
+        return
+    
+    try:
+        with open(legacy_filename, "rb") as f:
+            legacy_data = orjson.loads(f.read())
         
-        return flights
+        stem = os.path.basename(filename)[len("flight_prices_"):-len(".jsonl")]
+        route = legacy_data.get("route", stem.replace("_", " to ", 1))
+        with open(filename, "wb") as f:
+            for search in legacy_data.get("searches", []):
+                f.write(orjson.dumps({"route": route, **search}) + b"\n")
         
+        # Keep the original around instead of deleting history
+        os.replace(legacy_filename, legacy_filename + ".bak")
     except Exception as e:
-        print(f"Error parsing flight data: {e}")
-        return flights
+        print(f"Error migrating {legacy_filename}: {e}")
+
+def _archive_old_searches(filename: str):
+    """
+    Move all but the newest MAX_HISTORY searches of a history file into its archive file
+    
+    Args:
+        filename (str): Path of the route's JSON Lines history file
+    """
+    with open(filename, "rb") as f:
+        lines = f.readlines()
+    if len(lines) <= MAX_HISTORY:
+        return
+    
+    os.makedirs(ARCHIVE_DIR, exist_ok=True)
+    with open(f"{ARCHIVE_DIR}/{os.path.basename(filename)}", "ab") as f:
+        f.writelines(lines[:-MAX_HISTORY])
+    
+    tmp_filename = filename + ".tmp"
+    with open(tmp_filename, "wb") as f:
+        f.writelines(lines[-MAX_HISTORY:])
+    os.replace(tmp_filename, filename)
+
+def flight_summary_path(from_city: str, to_city: str) -> str:
+    """
+    Get the running price summary sidecar file for a route
+    
+    Args:
+        from_city (str): Origin city
+        to_city (str): Destination city
+    
+    Returns:
+        str: Path to the route's summary file
+    """
+    return f"{DATA_DIR}/flight_prices_{from_city}_{to_city}.summary.json"
+
+def search_average_price(search: dict):
+    """
+    Get the average flight price of a saved search
+    
+    Args:
+        search (dict): Search entry from the history file
+    
+    Returns:
+        float: Average price, or None if the search has no priced flights
+    """
+    prices = [float(f.get("price", 0)) for f in search.get("flights", []) if f.get("price")]
+    return sum(prices) / len(prices) if prices else None
+
+def search_average_prices(searches: list) -> np.ndarray:
+    """
+    Get the average flight price of every saved search with priced flights in one vectorized pass
+    
+    Args:
+        searches (list): Search entries from the history file
+    
+    Returns:
+        np.ndarray: Per-search average prices, oldest first (searches without prices are skipped)
+    """
+    counts = []
+    prices = []
+    for search in searches:
+        search_prices = [f["price"] for f in search.get("flights", []) if f.get("price")]
+        if search_prices:
+            counts.append(len(search_prices))
+            prices.extend(search_prices)
+    
+    if not counts:
+        return np.empty(0)
+    
+    counts = np.array(counts)
+    prices = np.fromiter((float(p) for p in prices), dtype=np.float64, count=len(prices))
+    starts = np.concatenate(([0], np.cumsum(counts[:-1])))
+    return np.add.reduceat(prices, starts) / counts
+
+def _add_to_price_summary(summary: dict, search: dict):
+    """Fold one search into the running {searches, count, sum, sum_sq, min, max} summary."""
+    summary["searches"] += 1
+    avg_price = search_average_price(search)
+    if avg_price is None:
+        return
+    
+    summary["count"] += 1
+    summary["sum"] += avg_price
+    summary["sum_sq"] += avg_price * avg_price
+    summary["min"] = avg_price if summary["min"] is None else min(summary["min"], avg_price)
+    summary["max"] = avg_price if summary["max"] is None else max(summary["max"], avg_price)
+
+def load_price_summary(from_city: str, to_city: str) -> dict:
+    """
+    Load running statistics of per-search average prices for a route
+    
+    Rebuilt from the history file when the sidecar is missing or unreadable.
+    
+    Args:
+        from_city (str): Origin city
+        to_city (str): Destination city
+    
+    Returns:
+        dict: Summary with searches, count, sum, sum_sq, min and max
+    """
+    try:
+        with open(flight_summary_path(from_city, to_city), "rb") as f:
+            return orjson.loads(f.read())
+    except (FileNotFoundError, orjson.JSONDecodeError):
+        pass
+    
+    searches = load_recent_searches(from_city, to_city, None)
+    averages = search_average_prices(searches)
+    has_prices = averages.size > 0
+    return {
+        "searches": len(searches),
+        "count": int(averages.size),
+        "sum": float(averages.sum()),
+        "sum_sq": float(averages @ averages),
+        "min": float(averages.min()) if has_prices else None,
+        "max": float(averages.max()) if has_prices else None
+    }
+
+def _save_price_summary(from_city: str, to_city: str, summary: dict):
+    """Atomically write the route's summary sidecar."""
+    filename = flight_summary_path(from_city, to_city)
+    tmp_filename = filename + ".tmp"
+    with open(tmp_filename, "wb") as f:
+        f.write(orjson.dumps(summary))
+    os.replace(tmp_filename, filename)
+
+def _flights_fingerprint(flights: list) -> str:
+    """Hash the flights' content, ignoring their per-search timestamps, to spot repeated results."""
+    content = [{key: value for key, value in flight.items() if key != "timestamp"} for flight in flights]
+    return hashlib.blake2b(orjson.dumps(content, option=orjson.OPT_SORT_KEYS), digest_size=16).hexdigest()
 
 def save_flight_data(flights: list, from_city: str, to_city: str) -> str:
     """
-    Save flight data to local JSON file, appending to existing file for same route
+    Save flight data to the route's local JSON Lines file, appending one line per search
     
     Args:
         flights (list): List of flight data dictionaries
@@ -90,46 +380,210 @@ def save_flight_data(flights: list, from_city: str, to_city: str) -> str:
         str: Status message
     """
     try:
-        # Ensure data directory exists
-        data_dir = "data"
-        os.makedirs(data_dir, exist_ok=True)
-        
         # Create filename without timestamp for same route
-        filename = f"{data_dir}/flight_prices_{from_city}_{to_city}.json"
+        filename = flight_data_path(from_city, to_city)
+        _migrate_legacy_flight_data(filename)
+        summary = load_price_summary(from_city, to_city)
         
-        # Load existing data if file exists
-        existing_data = {
-            "route": f"{from_city} to {to_city}",
-            "searches": []
-        }
-        
-        if os.path.exists(filename):
-            try:
-                with open(filename, "r") as f:
-                    existing_data = json.load(f)
-            except:
-                pass  # Use default structure if file is corrupted
+        # Don't append a search whose flights repeat the last saved search
+        fingerprint = _flights_fingerprint(flights)
+        if flights and summary.get("last_flights_hash") == fingerprint:
+            return f"Flight data saved to {filename} (unchanged since the last search, not appended again)"
         
         # Add new search data
         search_entry = {
+            "route": f"{from_city} to {to_city}",
             "search_timestamp": datetime.now().isoformat(),
             "flights": flights,
             "total_flights_found": len(flights)
         }
         
-        existing_data["searches"].append(search_entry)
+        # Append only the new search instead of rewriting the whole history
+        with open(filename, "ab") as f:
+            f.write(orjson.dumps(search_entry) + b"\n")
+        
+        # Keep the O(1) summary in step with the history
+        _add_to_price_summary(summary, search_entry)
+        summary["last_flights_hash"] = fingerprint
+        _save_price_summary(from_city, to_city, summary)
         
-        # Save updated data
-        with open(filename, "w") as f:
-            json.dump(existing_data, f, indent=4)
+        # Let the file grow to twice MAX_HISTORY, then archive back down (amortized O(1) per save)
+        if summary["searches"] >= 2 * MAX_HISTORY and summary["searches"] % MAX_HISTORY == 0:
+            _archive_old_searches(filename)
         
         return f"Flight data appended to {filename}"
         
     except Exception as e:
         return f"Error saving flight data: {str(e)}"
 
-@tool
-def tavily_price_tracker(from_city: str, to_city: str, max_price: str) -> str:
+def read_recent_searches(file_path, count=1) -> list:
+    """
+    Read the most recent searches from a JSON Lines history file without parsing the rest
+    
+    A legacy .json history next to a missing file is migrated first.
+    
+    Args:
+        file_path: Path to the history file
+        count (int): Number of searches to return (None for the full history)
+    
+    Returns:
+        list: Search entries, oldest first (empty list if the file is missing)
+    """
+    if not os.path.exists(file_path):
+        _migrate_legacy_flight_data(file_path)
+    
+    try:
+        with open(file_path, "rb") as f:
+            lines = deque(f, maxlen=count)
+    except FileNotFoundError:
+        return []
+    
+    searches = []
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            searches.append(orjson.loads(line))
+        except orjson.JSONDecodeError:
+            continue  # Skip a partially written line
+    return searches
+
+def load_recent_searches(from_city: str, to_city: str, count=1) -> list:
+    """
+    Load the most recent searches saved for a route
+    
+    Args:
+        from_city (str): Origin city
+        to_city (str): Destination city
+        count (int): Number of searches to return (None for the full history)
+    
+    Returns:
+        list: Search entries, oldest first
+    """
+    return read_recent_searches(flight_data_path(from_city, to_city), count)
+
+def _prepare_search(from_city: str, to_city: str, max_price: str):
+    """
+    Validate tool inputs, check the result cache and build the Tavily request
+    
+    Returns:
+        tuple: (result, None) when the call can be answered without the API,
+               otherwise (None, request) with max_price, cache_key, api_data and headers
+    """
+    # Validate required parameters
+    if not all([to_city, from_city, max_price]):
+        return "Error: Missing required parameters. Please provide from_city, to_city, and max_price.", None
+    
+    # Validate max_price is a number
+    try:
+        max_price = int(max_price)
+    except (ValueError, TypeError):
+        return "Error: max_price must be a valid integer.", None
+    
+    # Serve repeated searches for the same route from the cache
+    cache_key = _cache_key(from_city, to_city, max_price)
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        return cached, None
+    
+    if _HEADERS is None:
+        return "Error: TAVILY_API_KEY not found in environment variables.", None
+    
+    # API request data
+    api_data = {
+        "query": f"flight prices {from_city} to {to_city} current prices",
+        "search_depth": TAVILY_SEARCH_DEPTH,
+        "include_answer": True,
+        "include_raw_content": TAVILY_INCLUDE_RAW_CONTENT,
+        "max_results": TAVILY_MAX_RESULTS
+    }
+    
+    print(f"🔍 Searching for flights from {from_city} to {to_city} under ${max_price}...")
+    
+    return None, {
+        "max_price": max_price,
+        "cache_key": cache_key,
+        "api_data": api_data,
+        "headers": _HEADERS
+    }
+
+def _handle_search_response(status_code: int, flights: list, text: str, from_city: str, to_city: str, request: dict) -> str:
+    """
+    Turn a Tavily API response into the tool's result string
+    
+    Args:
+        status_code (int): HTTP status code
+        flights (list): Flights parsed from the body (only used on success)
+        text (str): Raw response text (only used on errors)
+        from_city (str): Origin city
+        to_city (str): Destination city
+        request (dict): Request built by _prepare_search
+    
+    Returns:
+        str: Formatted flight price information or error message
+    """
+    max_price = request["max_price"]
+    cache_key = request["cache_key"]
+    
+    # Check if request was successful
+    if status_code == 200:
+        # Save data locally
+        save_status = save_flight_data(flights, from_city, to_city)
+        
+        # Format response
+        if flights:
+            flight_summary = []
+            for i, flight in enumerate(flights[:3], 1):  # Show top 3
+                flight_summary.append(f"{i}. ${flight['price']:.2f}")
+            
+            result = f"✅ Found {len(flights)} flights from {from_city} to {to_city} under ${max_price}:\n"
+            result += "\n".join(flight_summary)
+            result += f"\n\n💾 {save_status}"
+            
+            return _cache_put(cache_key, result, CACHE_TTL)
+        else:
+            result = f"❌ No flights found from {from_city} to {to_city} under ${max_price}. {save_status}"
+            return _cache_put(cache_key, result, CACHE_TTL)
+            
+    elif status_code == 429:
+        # API rate limited - return backup hardcoded data
+        return _cache_put(cache_key, get_backup_flight_data(from_city, to_city, max_price), BACKUP_CACHE_TTL)
+    else:
+        error_msg = f"API request failed with status code: {status_code}"
+        if text:
+            error_msg += f"\nResponse: {text[:200]}..."
+        return error_msg
+
+def _get_http_session() -> aiohttp.ClientSession:
+    """
+    Get the shared aiohttp session for the running event loop, creating it if needed
+    
+    Returns:
+        aiohttp.ClientSession: Session reused across async tool calls
+    """
+    global _http_session, _http_session_loop
+    
+    # No await between the check and the assignment, so this is race-free within a loop
+    loop = asyncio.get_running_loop()
+    if _http_session is None or _http_session.closed or _http_session_loop is not loop:
+        ssl_context = ssl.create_default_context(cafile=certifi.where())
+        _http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(ssl=ssl_context, limit=POOL_MAXSIZE, limit_per_host=POOL_CONNECTIONS),
+            timeout=aiohttp.ClientTimeout(total=30)
+        )
+        _http_session_loop = loop
+    return _http_session
+
+async def aclose_http_session():
+    """Close the shared aiohttp session (call before the event loop that uses it shuts down)."""
+    global _http_session, _http_session_loop
+    if _http_session is not None and _http_session_loop is asyncio.get_running_loop():
+        await _http_session.close()
+    _http_session = None
+    _http_session_loop = None
+
+def _track_flight_prices(from_city: str, to_city: str, max_price: str) -> str:
     """
     Fetch flight prices using Tavily API
     
@@ -141,90 +595,106 @@ def tavily_price_tracker(from_city: str, to_city: str, max_price: str) -> str:
     Returns:
         str: Formatted flight price information or error message
     """
+    request = None
     try:
-        # Validate required parameters
-        if not all([to_city, from_city, max_price]):
-            return "Error: Missing required parameters. Please provide from_city, to_city, and max_price."
-        
-        # Validate max_price is a number
-        try:
-            max_price = int(max_price)
-        except (ValueError, TypeError):
-            return "Error: max_price must be a valid integer."
-        
-        # Get API key from environment
-        api_key = os.getenv("TAVILY_API_KEY")
-        if not api_key:
-            return "Error: TAVILY_API_KEY not found in environment variables."
-        
-        # Construct query for flight prices
-        query = f"flight prices {from_city} to {to_city} current prices"
-        
-        # Tavily API endpoint
-        url = "https://api.tavily.com/search"
-        
-        # API request data with enhanced search
-        api_data = {
-            "query": query,
-            "search_depth": "advanced",
-            "include_answer": True,
-            "include_raw_content": True,
-            "max_results": 10
-        }
-        
-        # Set up Authorization header with Bearer token
-        headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json"
-        }
-        
-        print(f"🔍 Searching for flights from {from_city} to {to_city} under ${max_price}...")
+        result, request = _prepare_search(from_city, to_city, max_price)
+        if result is not None:
+            return result
         
         # Make API request with POST method and proper authentication
-        response = requests.post(url, json=api_data, headers=headers, timeout=30)
+        # Stream the body and stop reading once enough prices are found
+        with _SESSION.post(TAVILY_SEARCH_URL, json=request["api_data"], headers=request["headers"], timeout=30, stream=True) as response:
+            flights, text = None, ""
+            if response.status_code == 200:
+                response.raw.decode_content = True
+                scanner = _StreamingPriceScanner(request["max_price"])
+                for prefix, event, value in ijson.parse(response.raw):
+                    if scanner.feed(prefix, event, value):
+                        break
+                flights = scanner.flights()
+            else:
+                text = response.text
         
-        # Check if request was successful
-        if response.status_code == 200:
-            data = response.json()
+        return _handle_search_response(response.status_code, flights, text, from_city, to_city, request)
             
+    except requests.exceptions.Timeout:
+        return _cache_put(request["cache_key"], get_backup_flight_data(from_city, to_city, request["max_price"]), BACKUP_CACHE_TTL)
+    except requests.exceptions.RequestException as e:
+        return get_backup_flight_data(from_city, to_city, request["max_price"])
+    except Exception as e:
+        return get_backup_flight_data(from_city, to_city, request["max_price"] if request else max_price)
 
-            
-            # Parse flight data from response
-            flights = parse_flight_data(data, max_price)
-            
-            # Save data locally
-            save_status = save_flight_data(flights, from_city, to_city)
-            
-            # Format response
-            if flights:
-                flight_summary = []
-                for i, flight in enumerate(flights[:3], 1):  # Show top 3
-                    flight_summary.append(f"{i}. ${flight['price']:.2f}")
-                
-                result = f"✅ Found {len(flights)} flights from {from_city} to {to_city} under ${max_price}:\n"
-                result += "\n".join(flight_summary)
-                result += f"\n\n💾 {save_status}"
-                result += f"\n\n📊 Raw API response available in saved file."
-                
-                return result
+async def _afetch_flight_prices(from_city: str, to_city: str, max_price: str) -> str:
+    """
+    Async variant of _track_flight_prices that does not block the event loop
+    
+    Args:
+        from_city (str): Origin city
+        to_city (str): Destination city  
+        max_price (str): Maximum price threshold
+    
+    Returns:
+        str: Formatted flight price information or error message
+    """
+    request = None
+    try:
+        result, request = _prepare_search(from_city, to_city, max_price)
+        if result is not None:
+            return result
+        
+        session = _get_http_session()
+        async with session.post(TAVILY_SEARCH_URL, json=request["api_data"], headers=request["headers"]) as response:
+            status_code = response.status
+            flights, text = None, ""
+            if status_code == 200:
+                # Stream the body and stop reading once enough prices are found
+                scanner = _StreamingPriceScanner(request["max_price"])
+                async for prefix, event, value in ijson.parse_async(response.content):
+                    if scanner.feed(prefix, event, value):
+                        break
+                flights = scanner.flights()
             else:
-                return f"❌ No flights found from {from_city} to {to_city} under ${max_price}. {save_status}"
-                
-        elif response.status_code == 429:
-            # API rate limited - return backup hardcoded data
-            return get_backup_flight_data(from_city, to_city, max_price)
-        else:
-            error_msg = f"API request failed with status code: {response.status_code}"
-            if response.text:
-                error_msg += f"\nResponse: {response.text[:200]}..."
-            return error_msg
+                text = await response.text()
+        
+        return _handle_search_response(status_code, flights, text, from_city, to_city, request)
             
-    except requests.exceptions.Timeout:
-        return get_backup_flight_data(from_city, to_city, max_price)
-    except requests.exceptions.RequestException as e:
-        return get_backup_flight_data(from_city, to_city, max_price)
+    except asyncio.TimeoutError:
+        return _cache_put(request["cache_key"], get_backup_flight_data(from_city, to_city, request["max_price"]), BACKUP_CACHE_TTL)
+    except aiohttp.ClientError as e:
+        return get_backup_flight_data(from_city, to_city, request["max_price"])
     except Exception as e:
-        return get_backup_flight_data(from_city, to_city, max_price)
+        return get_backup_flight_data(from_city, to_city, request["max_price"] if request else max_price)
+
+async def _atrack_flight_prices(from_city: str, to_city: str, max_price: str) -> str:
+    """
+    Run an async search, joining an identical search that is already in flight
+    
+    Args:
+        from_city (str): Origin city
+        to_city (str): Destination city  
+        max_price (str): Maximum price threshold
+    
+    Returns:
+        str: Formatted flight price information or error message
+    """
+    key = _cache_key(from_city, to_city, max_price)
+    
+    # No await between the lookup and the insert, so no lock is needed within a loop
+    task = _inflight.get(key)
+    if task is None or task.get_loop() is not asyncio.get_running_loop():
+        task = asyncio.ensure_future(_afetch_flight_prices(from_city, to_city, max_price))
+        _inflight[key] = task
+        task.add_done_callback(lambda done: _inflight.pop(key, None) if _inflight.get(key) is done else None)
+    
+    # Shield so one cancelled caller does not cancel the search for the others
+    return await asyncio.shield(task)
+
+# Sync callers use .invoke(), async callers use .ainvoke() without blocking the event loop
+tavily_price_tracker = StructuredTool.from_function(
+    func=_track_flight_prices,
+    coroutine=_atrack_flight_prices,
+    name="tavily_price_tracker"
+)
 
 def get_backup_flight_data(from_city: str, to_city: str, max_price: int) -> str:
     """
@@ -238,30 +708,19 @@ def get_backup_flight_data(from_city: str, to_city: str, max_price: int) -> str:
     Returns:
         str: Formatted backup flight information
     """
-    import random
-    
-    # Generate realistic backup flight prices (60-90% of max_price)
+    # Generate realistic backup flight prices (60-90% of max_price), cheapest first
     base_price = max_price * 0.6
     price_range = max_price * 0.3
+    prices = np.sort(base_price + _RNG.random(BACKUP_FLIGHT_COUNT) * price_range).round(2)
+    backup_flights = prices[prices <= max_price]
     
-    backup_flights = []
-    for i in range(3):  # Generate 3 sample flights
-        price = round(base_price + (random.random() * price_range), 2)
-        if price <= max_price:
-            backup_flights.append(price)
-    
-    # Sort prices (cheapest first)
-    backup_flights.sort()
-    
-    if backup_flights:
-        flight_summary = []
-        airlines = ["Air Canada", "WestJet", "Porter Airlines", "Delta", "United", "American Airlines"]
-        times = ["8:30 AM", "12:45 PM", "4:20 PM", "7:15 PM", "9:50 AM", "2:30 PM"]
-        
-        for i, price in enumerate(backup_flights, 1):
-            airline = random.choice(airlines)
-            time = random.choice(times)
-            flight_summary.append(f"{i}. ${price:.2f} - {airline} departing {time}")
+    if backup_flights.size:
+        airlines = _RNG.choice(_AIRLINES, backup_flights.size)
+        times = _RNG.choice(_TIMES, backup_flights.size)
+        flight_summary = [
+            f"{i}. ${price:.2f} - {airline} departing {time}"
+            for i, (price, airline, time) in enumerate(zip(backup_flights, airlines, times), 1)
+        ]
         
         result = f"🔄 Tavily API temporarily unavailable - showing backup flight data:\n"
         result += f"✈️ Found {len(backup_flights)} flights from {from_city} to {to_city} under ${max_price}:\n\n"
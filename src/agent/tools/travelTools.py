@@ -2,8 +2,65 @@
 #TOOLS RELATED TO TRAVEL, TAVILY ETC CAN GO HERE
 
 
+import functools
+from dataclasses import dataclass
+import numpy as np
 from langchain.tools import tool
 
+@dataclass(frozen=True)
+class _Destination:
+    """Read-only catalog entry."""
+    __slots__ = ("name", "price", "rating")
+    name: str
+    price: int
+    rating: float
+
+# Mock travel search data (replace with real API)
+_DESTINATIONS = (
+    _Destination("Paris", 1200, 4.5),
+    _Destination("Tokyo", 1500, 4.7),
+    _Destination("Bali", 800, 4.3),
+    _Destination("New York", 1000, 4.4),
+    _Destination("Barcelona", 900, 4.2),
+    _Destination("Thailand", 700, 4.4)
+)
+
+# Column views of _DESTINATIONS: prices and names are matched in one vectorized pass
+_NAMES_FOLDED = np.array([dest.name.casefold() for dest in _DESTINATIONS])
+_PRICES = np.asarray([dest.price for dest in _DESTINATIONS], dtype=np.int32)
+_MIN_PRICE = _PRICES.min()
+
+# Catalog indices ordered by price, for budget-only searches
+_ORDER = np.argsort(_PRICES, kind="stable")
+_PRICES_SORTED = _PRICES[_ORDER]
+
+def _format_results(query: str, budget: float, filtered: list) -> str:
+    """Format matching destinations as the tool's result string."""
+    if not filtered:
+        return f"No destinations found for '{query}' within budget of ${budget}"
+    
+    lines = [f"Found {len(filtered)} destinations for '{query}' within ${budget}:"]
+    lines += [f"- {dest.name}: ${dest.price} (Rating: {dest.rating}⭐)" for dest in filtered]
+    return "\n".join(lines) + "\n"
+
+@functools.lru_cache(maxsize=256)
+def _search(query: str, budget: float) -> str:
+    """Filter destinations for a parsed query and budget (cached; the catalog is static)."""
+    # Filter by budget and query (nothing fits below the cheapest destination)
+    filtered = []
+    if budget >= _MIN_PRICE:
+        q = query.casefold()
+        if not q:
+            # Budget only: binary search the sorted prices, then restore catalog order
+            k = np.searchsorted(_PRICES_SORTED, budget, side="right")
+            filtered = [_DESTINATIONS[i] for i in np.sort(_ORDER[:k])]
+            return _format_results(query, budget, filtered)
+        
+        matches = np.flatnonzero((_PRICES <= budget) & (np.char.find(_NAMES_FOLDED, q) >= 0))
+        filtered = [_DESTINATIONS[i] for i in matches]
+    
+    return _format_results(query, budget, filtered)
+
 @tool  
 def search_destinations(input_str: str) -> str:
     """Search for travel destinations based on query and budget. Input format: 'query,budget' (e.g., 'paris,1500')"""
@@ -17,30 +74,6 @@ def search_destinations(input_str: str) -> str:
             query = input_str.strip()
             budget = 2000.0  # default budget
         
-        # Mock travel search (replace with real API)
-        destinations = [
-            {"name": "Paris", "price": 1200, "rating": 4.5},
-            {"name": "Tokyo", "price": 1500, "rating": 4.7},
-            {"name": "Bali", "price": 800, "rating": 4.3},
-            {"name": "New York", "price": 1000, "rating": 4.4},
-            {"name": "Barcelona", "price": 900, "rating": 4.2},
-            {"name": "Thailand", "price": 700, "rating": 4.4}
-        ]
-        
-        # Filter by budget and query
-        filtered = []
-        for dest in destinations:
-            if dest["price"] <= budget:
-                if not query or query.lower() in dest["name"].lower():
-                    filtered.append(dest)
-        
-        if not filtered:
-            return f"No destinations found for '{query}' within budget of ${budget}"
-        
-        result = f"Found {len(filtered)} destinations for '{query}' within ${budget}:\n"
-        for dest in filtered:
-            result += f"- {dest['name']}: ${dest['price']} (Rating: {dest['rating']}⭐)\n"
-        
-        return result
+        return _search(query, budget)
     except Exception as e:
         return f"Error searching destinations: {str(e)}"
@@ -13,7 +13,14 @@ class FlightDataProcessor {
   async getAllFlightFiles() {
     try {
       const files = await fs.readdir(this.dataDir);
-      return files.filter(file => file.startsWith('flight_prices_') && file.endsWith('.json'));
+      const histories = files.filter(file => file.startsWith('flight_prices_'));
+      const jsonl = new Set(histories.filter(file => file.endsWith('.jsonl')));
+
+      // Legacy .json histories are read until the tracker migrates them to .jsonl
+      const legacy = histories.filter(file =>
+        file.endsWith('.json') && !file.endsWith('.summary.json') && !jsonl.has(`${file}l`)
+      );
+      return [...jsonl, ...legacy];
     } catch (error) {
       console.error('Error reading data directory:', error);
       return [];
@@ -24,7 +31,23 @@ class FlightDataProcessor {
     try {
       const filePath = path.join(this.dataDir, filename);
       const data = await fs.readFile(filePath, 'utf8');
-      return JSON.parse(data);
+
+      if (!filename.endsWith('.jsonl')) {
+        return JSON.parse(data);
+      }
+
+      // JSON Lines history: one search per line, the latest complete search is the last line
+      // that parses (a save still being appended can leave a partial trailing line)
+      const lines = data.trim().split('\n');
+      for (let i = lines.length - 1; i >= 0; i--) {
+        try {
+          const latestSearch = JSON.parse(lines[i]);
+          return { route: latestSearch.route, searches: [latestSearch] };
+        } catch {
+          // Partial or corrupt line, try the one before it
+        }
+      }
+      return null;
     } catch (error) {
       console.error(`Error reading flight file ${filename}:`, error);
       return null;
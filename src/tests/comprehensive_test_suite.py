@@ -5,20 +5,78 @@ Tests all aspects including normal operation, error scenarios, and notifications
 """
 
 import asyncio
-import json
+import contextlib
+import functools
 import sys
 import os
 import time
+import orjson
 from pathlib import Path
 from datetime import datetime
+from unittest import mock
 
-# Add the src directory to the path
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+# The notifier imports its siblings by bare name (discord_notifier and real_time_data_manager
+# from src/agent, the rest from src/agent/tools), so import them the same way to share one copy
+_AGENT_DIR = os.path.join(os.path.dirname(__file__), '..', 'agent')
+sys.path[:0] = [_AGENT_DIR, os.path.join(_AGENT_DIR, 'tools')]
 
-from src.agent.langchain_notifier import load_prices, send_notification, THRESHOLD, load_config
-from src.agent.notification_manager import NotificationManager
-from src.agent.real_time_data_manager import RealTimeDataManager
-from src.agent.discord_notifier import DiscordNotifier
+import langchain_notifier as notifier
+from langchain_notifier import load_prices, send_notification, THRESHOLD, load_config, PRICE_FILE, DATA_DIRECTORY
+from notification_manager import NotificationManager
+from real_time_data_manager import RealTimeDataManager
+from discord_notifier import DiscordNotifier
+from tools.tavily_price_tracker import aclose_http_session
+
+# Config file does not change during a run, so it is parsed once
+load_config_cached = functools.lru_cache(maxsize=1)(load_config)
+
+# Flight data keyed by the modification times of the price files, so repeat loads skip the disk
+_prices_cache = {}
+
+def _price_files_signature():
+    """Return (path, mtime) for every flight price file load_prices can read."""
+    signature = []
+    for directory in {Path(DATA_DIRECTORY), PRICE_FILE.parent}:
+        try:
+            with os.scandir(directory) as entries:
+                signature.extend(
+                    (entry.path, entry.stat().st_mtime_ns) for entry in entries
+                    if entry.name.startswith("flight_prices") and entry.is_file()
+                )
+        except FileNotFoundError:
+            continue
+    return tuple(sorted(signature))
+
+async def load_prices_cached():
+    """load_prices, reusing the last result while the price files are unchanged."""
+    key = _price_files_signature()
+    if key not in _prices_cache:
+        _prices_cache.clear()
+        _prices_cache[key] = await load_prices()
+    return _prices_cache[key]
+
+# In-memory price file contents for the error scenarios
+CORRUPTED_JSON = b'[{"price": 150.0, "airline": "Test Air", "destination": '
+MALFORMED_JSON = b'[{"price": "not a number"}, {"airline": "No Price Air"}, "not a flight"]'
+
+@contextlib.contextmanager
+def _patched_prices(payload):
+    """
+    Make load_prices read `payload` (bytes, or None for a missing file) instead of the real data.
+    Forces the file-based loading path with an empty cache; nothing on disk is touched.
+    """
+    optimizer = notifier.performance_optimizer
+    
+    with contextlib.ExitStack() as stack:
+        stack.enter_context(mock.patch.object(notifier, "data_manager", None))
+        stack.enter_context(mock.patch.dict(optimizer.data_cache, clear=True))
+        if payload is None:
+            stack.enter_context(mock.patch.object(notifier, "PRICE_FILE", Path("data/flight_prices_missing.json")))
+        else:
+            # Any existing file passes the stat check; the read itself parses `payload` instead
+            stack.enter_context(mock.patch.object(notifier, "PRICE_FILE", Path(__file__)))
+            stack.enter_context(mock.patch.object(type(optimizer), "_read_json", staticmethod(lambda _path: orjson.loads(payload))))
+        yield
 
 class TestResults:
     """Track test results and statistics."""
@@ -28,6 +86,7 @@ class TestResults:
         self.passed_tests = 0
         self.failed_tests = 0
         self.test_details = []
+        self.failed_details = []  # (name, details) of failed tests, for the summary
     
     def add_test(self, test_name, passed, details=""):
         """Add a test result."""
@@ -38,6 +97,7 @@ class TestResults:
         else:
             self.failed_tests += 1
             status = "❌ FAIL"
+            self.failed_details.append((test_name, details))
         
         self.test_details.append({
             "name": test_name,
@@ -61,9 +121,8 @@ class TestResults:
         
         if self.failed_tests > 0:
             print("\n❌ Failed Tests:")
-            for test in self.test_details:
-                if "FAIL" in test["status"]:
-                    print(f"   - {test['name']}: {test['details']}")
+            for test_name, details in self.failed_details:
+                print(f"   - {test_name}: {details}")
         
         print("\n" + "=" * 60)
 
@@ -73,7 +132,7 @@ async def test_normal_operation(results):
     
     try:
         # Test 1: Load valid flight data
-        flights = await load_prices()
+        flights = await load_prices_cached()
         results.add_test(
             "Load Valid Flight Data",
             len(flights) > 0,
@@ -110,51 +169,22 @@ async def test_error_scenarios(results):
     
     # Test 1: Corrupted JSON file
     try:
-        corrupted_file = Path("data/flight_prices_corrupted.json")
-        if corrupted_file.exists():
-            # Temporarily rename the good file and use corrupted one
-            good_file = Path("data/flight_prices.json")
-            backup_file = Path("data/flight_prices_backup.json")
-            
-            if good_file.exists():
-                good_file.rename(backup_file)
-            
-            corrupted_file.rename(good_file)
-            
-            # Try to load corrupted data
+        with _patched_prices(CORRUPTED_JSON):
             flights = await load_prices()
-            
-            # Restore good file
-            good_file.rename(corrupted_file)
-            if backup_file.exists():
-                backup_file.rename(good_file)
-            
-            results.add_test(
-                "Corrupted JSON Handling",
-                len(flights) == 0,  # Should return empty list
-                "Gracefully handled corrupted JSON"
-            )
-        else:
-            results.add_test("Corrupted JSON Handling", True, "Skipped - no corrupted file")
+        
+        results.add_test(
+            "Corrupted JSON Handling",
+            len(flights) == 0,  # Should return empty list
+            "Gracefully handled corrupted JSON"
+        )
             
     except Exception as e:
         results.add_test("Corrupted JSON Handling", False, f"Error: {e}")
     
     # Test 2: Missing file handling
     try:
-        # Temporarily rename the data file
-        data_file = Path("data/flight_prices.json")
-        backup_file = Path("data/flight_prices_backup.json")
-        
-        if data_file.exists():
-            data_file.rename(backup_file)
-        
-        # Try to load missing file
-        flights = await load_prices()
-        
-        # Restore file
-        if backup_file.exists():
-            backup_file.rename(data_file)
+        with _patched_prices(None):
+            flights = await load_prices()
         
         results.add_test(
             "Missing File Handling",
@@ -167,32 +197,14 @@ async def test_error_scenarios(results):
     
     # Test 3: Malformed flight data
     try:
-        malformed_file = Path("data/flight_prices_malformed.json")
-        if malformed_file.exists():
-            # Temporarily use malformed data
-            good_file = Path("data/flight_prices.json")
-            backup_file = Path("data/flight_prices_backup.json")
-            
-            if good_file.exists():
-                good_file.rename(backup_file)
-            
-            malformed_file.rename(good_file)
-            
-            # Try to process malformed data
+        with _patched_prices(MALFORMED_JSON):
             flights = await load_prices()
-            
-            # Restore good file
-            good_file.rename(malformed_file)
-            if backup_file.exists():
-                backup_file.rename(good_file)
-            
-            results.add_test(
-                "Malformed Data Handling",
-                True,  # Should not crash
-                f"Processed {len(flights)} flights from malformed data"
-            )
-        else:
-            results.add_test("Malformed Data Handling", True, "Skipped - no malformed file")
+        
+        results.add_test(
+            "Malformed Data Handling",
+            True,  # Should not crash
+            f"Processed {len(flights)} flights from malformed data"
+        )
             
     except Exception as e:
         results.add_test("Malformed Data Handling", False, f"Error: {e}")
@@ -241,7 +253,7 @@ async def test_notification_system(results):
     
     # Test 2: Discord Notifier (if configured)
     try:
-        from src.agent.langchain_notifier import DISCORD_WEBHOOK_URL
+        from langchain_notifier import DISCORD_WEBHOOK_URL
         if DISCORD_WEBHOOK_URL:
             discord_notifier = DiscordNotifier(DISCORD_WEBHOOK_URL)
             test_flight = {
@@ -319,7 +331,7 @@ async def test_configuration_system(results):
     
     try:
         # Test 1: Load configuration
-        config = load_config()
+        config = load_config_cached()
         results.add_test(
             "Configuration Loading",
             isinstance(config, dict),
@@ -353,7 +365,7 @@ async def test_continuous_operation(results):
     try:
         # Test 1: Multiple data loads
         for i in range(3):
-            flights = await load_prices()
+            flights = await load_prices_cached()
             if len(flights) == 0:
                 break
         
@@ -370,14 +382,17 @@ async def test_continuous_operation(results):
             {"price": 250.0, "airline": "Test Air 3", "destination": "Test City 3"}
         ]
         
+        notifications = await asyncio.gather(
+            *(send_notification(flight) for flight in test_flights),
+            return_exceptions=True
+        )
+        
         notifications_sent = 0
-        for flight in test_flights:
-            try:
-                notification = await send_notification(flight)
-                if notification:
-                    notifications_sent += 1
-            except Exception as e:
-                print(f"   ⚠️  Notification error: {e}")
+        for notification in notifications:
+            if isinstance(notification, Exception):
+                print(f"   ⚠️  Notification error: {notification}")
+            elif notification:
+                notifications_sent += 1
         
         results.add_test(
             "Continuous Notification Processing",
@@ -388,6 +403,14 @@ async def test_continuous_operation(results):
     except Exception as e:
         results.add_test("Continuous Operation", False, f"Error: {e}")
 
+# Categories safe to run concurrently (TestResults.add_test never awaits, so no lock is needed)
+PARALLEL_TESTS = (
+    test_normal_operation,
+    test_notification_system,
+    test_real_time_data_manager,
+    test_configuration_system
+)
+
 async def main():
     """Run all comprehensive tests."""
     print("🚀 Flight Price Monitor - Comprehensive Test Suite")
@@ -395,13 +418,17 @@ async def main():
     
     results = TestResults()
     
-    # Run all test categories
-    await test_normal_operation(results)
-    await test_error_scenarios(results)
-    await test_notification_system(results)
-    await test_real_time_data_manager(results)
-    await test_configuration_system(results)
-    await test_continuous_operation(results)
+    try:
+        # Notification history writes are synchronous load-modify-save with no await in between,
+        # and these categories record different flights, so they can share the file concurrently
+        await asyncio.gather(*(test(results) for test in PARALLEL_TESTS))
+        
+        # Error scenarios patch the notifier's data source, so they run on their own, then continuous operation
+        await test_error_scenarios(results)
+        await test_continuous_operation(results)
+    finally:
+        # Data refreshes share the tracker's HTTP session; close it once before the loop exits
+        await aclose_http_session()
     
     # Print results
     results.print_summary()
@@ -3,12 +3,42 @@
 Debug script for Tavily API key issues
 """
 
+import asyncio
 import os
-import requests
 import json
+import ssl
+import aiohttp
+import certifi
 from dotenv import load_dotenv
 
-def debug_tavily_api():
+# Load .env once at import rather than on every diagnostic run
+load_dotenv(override=False)
+
+# Probe request bodies, built once
+TAVILY_SEARCH_URL = "https://api.tavily.com/search"
+_BASIC_BODY = {
+    "query": "test query",
+    "search_depth": "basic"
+}
+_SEARCH_BODY = {
+    "query": "test",
+    "search_depth": "basic",
+    "include_answer": True
+}
+
+async def _probe(session, url, payload):
+    """POST one probe request and return (status, body), or (None, error message) on failure."""
+    try:
+        async with session.post(url, json=payload) as response:
+            return response.status, await response.text()
+    except asyncio.TimeoutError:
+        return None, "Request timed out"
+    except aiohttp.ClientError as e:
+        return None, f"Request failed: {e}"
+    except Exception as e:
+        return None, f"Unexpected error: {e}"
+
+async def debug_tavily_api():
     """Debug Tavily API key and connection issues"""
     
     print("🔍 Tavily API Debug Diagnostic")
@@ -16,8 +46,6 @@ def debug_tavily_api():
     
     # Step 1: Check environment loading
     print("1. Checking environment variables...")
-    load_dotenv()
-    
     api_key = os.getenv("TAVILY_API_KEY")
     if api_key:
         print(f"   ✅ API Key found: {api_key[:10]}...{api_key[-4:]}")
@@ -38,100 +66,92 @@ def debug_tavily_api():
         print(f"   ❌ No API key found in environment")
         return False
     
-    # Step 2: Test basic API call
-    print(f"\n2. Testing basic API call...")
-    
-    url = "https://api.tavily.com/search"
-    data = {
-        "query": "test query",
-        "search_depth": "basic"
-    }
-    
+    # Steps 2 and 3 probe the API over one shared session
+    url = TAVILY_SEARCH_URL
     headers = {
         "Authorization": f"Bearer {api_key}",
         "Content-Type": "application/json"
     }
     
-    try:
-        print(f"   🌐 Making request to: {url}")
-        print(f"   📝 Query: 'test query'")
-        print(f"   🔑 Using Authorization header with Bearer token")
+    ssl_context = ssl.create_default_context(cafile=certifi.where())
+    async with aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(ssl=ssl_context),
+        headers=headers,
+        timeout=aiohttp.ClientTimeout(total=10)
+    ) as session:
+        # Both probes start together; the alternative is only reported when the basic call fails,
+        # so on success it is cancelled rather than waited for
+        basic = asyncio.create_task(_probe(session, url, _BASIC_BODY))
+        alternative = asyncio.create_task(_probe(session, url, _SEARCH_BODY))
+        status_code, text = await basic
         
-        response = requests.post(url, json=data, headers=headers, timeout=10)
-        
-        print(f"   📊 Status Code: {response.status_code}")
+        if status_code == 200:
+            alternative.cancel()
+            await asyncio.gather(alternative, return_exceptions=True)
+        else:
+            search_status, search_text = await alternative
+    
+    # Step 2: Test basic API call
+    print(f"\n2. Testing basic API call...")
+    print(f"   🌐 Making request to: {url}")
+    print(f"   📝 Query: 'test query'")
+    print(f"   🔑 Using Authorization header with Bearer token")
+    
+    if status_code is None:
+        print(f"   ❌ {text}")
+    else:
+        print(f"   📊 Status Code: {status_code}")
         
-        if response.status_code == 200:
+        if status_code == 200:
             print(f"   ✅ API call successful!")
-            data = response.json()
-            print(f"   📄 Response keys: {list(data.keys())}")
+            try:
+                print(f"   📄 Response keys: {list(json.loads(text).keys())}")
+            except ValueError:
+                pass
             return True
             
-        elif response.status_code == 401:
+        elif status_code == 401:
             print(f"   ❌ Unauthorized (401) - API key issue")
-            print(f"   📄 Response: {response.text[:200]}...")
+            print(f"   📄 Response: {text[:200]}...")
             
             # Try to parse error details
             try:
-                error_data = response.json()
+                error_data = json.loads(text)
                 if "detail" in error_data:
                     print(f"   🔍 Error detail: {error_data['detail']}")
             except:
                 pass
                 
-        elif response.status_code == 403:
+        elif status_code == 403:
             print(f"   ❌ Forbidden (403) - Permission issue")
-            print(f"   📄 Response: {response.text[:200]}...")
+            print(f"   📄 Response: {text[:200]}...")
             
         else:
-            print(f"   ❌ Unexpected status: {response.status_code}")
-            print(f"   📄 Response: {response.text[:200]}...")
-            
-    except requests.exceptions.Timeout:
-        print(f"   ❌ Request timed out")
-    except requests.exceptions.RequestException as e:
-        print(f"   ❌ Request failed: {e}")
-    except Exception as e:
-        print(f"   ❌ Unexpected error: {e}")
+            print(f"   ❌ Unexpected status: {status_code}")
+            print(f"   📄 Response: {text[:200]}...")
     
     # Step 3: Test alternative endpoint
     print(f"\n3. Testing alternative endpoint...")
+    print(f"   🌐 Trying search endpoint with different params: {url}")
     
-    try:
-        # Try the search endpoint with different parameters
-        search_url = "https://api.tavily.com/search"
-        search_data = {
-            "query": "test",
-            "search_depth": "basic",
-            "include_answer": True
-        }
-        
-        search_headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json"
-        }
-        
-        print(f"   🌐 Trying search endpoint with different params: {search_url}")
-        search_response = requests.post(search_url, json=search_data, headers=search_headers, timeout=10)
-        
-        print(f"   📊 Search Status: {search_response.status_code}")
-        if search_response.status_code == 200:
+    if search_status is None:
+        print(f"   ❌ Search endpoint test failed: {search_text}")
+    else:
+        print(f"   📊 Search Status: {search_status}")
+        if search_status == 200:
             print(f"   ✅ Search endpoint works with POST method!")
         else:
-            print(f"   ❌ Search endpoint failed: {search_response.text[:100]}...")
-            
-    except Exception as e:
-        print(f"   ❌ Search endpoint test failed: {e}")
+            print(f"   ❌ Search endpoint failed: {search_text[:100]}...")
     
     # Step 4: Recommendations
     print(f"\n4. Recommendations:")
     
-    if response.status_code == 401:
+    if status_code == 401:
         print(f"   🔑 Get a new API key from: https://tavily.com/")
         print(f"   🔑 Make sure the key starts with 'tvly-'")
         print(f"   🔑 Check if the key has web-crawl permissions")
         
-    elif response.status_code == 403:
+    elif status_code == 403:
         print(f"   🔑 Check API key permissions in Tavily dashboard")
         print(f"   🔑 Verify the key has access to web-crawl feature")
         
@@ -142,7 +162,7 @@ def debug_tavily_api():
     return False
 
 if __name__ == "__main__":
-    success = debug_tavily_api()
+    success = asyncio.run(debug_tavily_api())
     
     if success:
         print(f"\n🎉 API key is working! The issue might be in our flight search code.")
@@ -4,18 +4,82 @@ Test script for Issue 2 Task 4: Testing & Validation
 Tests Tavily API integration with real flight routes
 """
 
+import asyncio
+import contextlib
+import heapq
+import io
 import sys
 import os
-import json
+import time
 from datetime import datetime
+from pathlib import Path
+from unittest import mock
+
+import orjson
 
 # Add the tools directory to path
 sys.path.append('src/agent/tools')
 
 # Import the main tool function
+import tavily_price_tracker as tracker_module
 from tavily_price_tracker import tavily_price_tracker
 
-def test_tavily_api_integration():
+def _tool_input(route):
+    """Map a test route (FROM/TO/maxPrice) to the price tracker's tool arguments."""
+    return {
+        "from_city": route.get("FROM", ""),
+        "to_city": route.get("TO", ""),
+        "max_price": str(route.get("maxPrice", ""))
+    }
+
+# Opt-in (TAVILY_TEST_CACHE=1): reuse successful route results for an hour so reruns don't spend
+# Tavily calls. Replayed results are reported as such and skip the data storage check.
+CACHE_FILE = Path("data/.tavily_test_cache.json")
+CACHE_TTL = 3600
+CACHE_ENABLED = os.getenv("TAVILY_TEST_CACHE") == "1"
+
+def _cache_key(route):
+    """Canonical cache key so case and whitespace differences still hit."""
+    return f"{str(route.get('FROM', '')).strip().lower()}|{str(route.get('TO', '')).strip().lower()}|{route.get('maxPrice', '')}"
+
+def _load_cache():
+    """Load unexpired cached results (empty if caching is off or the file is missing)."""
+    if not CACHE_ENABLED:
+        return {}
+    try:
+        cache = orjson.loads(CACHE_FILE.read_bytes())
+    except (FileNotFoundError, orjson.JSONDecodeError):
+        return {}
+    now = time.time()
+    return {key: entry for key, entry in cache.items() if entry["expires_at"] > now}
+
+def _save_cache(cache):
+    """Persist cached results for the next run."""
+    if CACHE_ENABLED:
+        CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        CACHE_FILE.write_bytes(orjson.dumps(cache))
+
+def _is_success(result):
+    """A route call succeeded if it found flights or cleanly reported none."""
+    return "✅ Found" in result or "❌ No flights found" in result
+
+async def _cached_search(route, cache):
+    """
+    Search a route, reusing a cached successful result when available.
+    
+    Returns:
+        tuple: (result, replayed) where replayed is True for a cached result
+    """
+    key = _cache_key(route)
+    if key in cache:
+        return cache[key]["result"], True
+    
+    result = await tavily_price_tracker.ainvoke(_tool_input(route))
+    if _is_success(result):
+        cache[key] = {"expires_at": time.time() + CACHE_TTL, "result": result}
+    return result, False
+
+async def test_tavily_api_integration():
     """Test the Tavily API integration with real flight routes"""
     
     print("🧪 Task 4: Testing Tavily API Integration")
@@ -37,43 +101,59 @@ def test_tavily_api_integration():
     
     results = []
     
-    for i, route in enumerate(test_routes, 1):
-        print(f"\n�� Test {i}: {route['FROM']} → {route['TO']}")
-        print(f"   Max price: ${route['maxPrice']}")
+    # Call the Tavily API tool for all routes concurrently
+    cache = _load_cache()
+    route_results = await asyncio.gather(
+        *(_cached_search(route, cache) for route in test_routes),
+        return_exceptions=True
+    )
+    _save_cache(cache)
+    
+    for i, (route, outcome) in enumerate(zip(test_routes, route_results), 1):
+        # Collect the route's report and write it out in one go
+        buf = io.StringIO()
+        print(f"\n�� Test {i}: {route['FROM']} → {route['TO']}", file=buf)
+        print(f"   Max price: ${route['maxPrice']}", file=buf)
         
         try:
-            # Call the Tavily API tool
-            result = tavily_price_tracker(route)
+            if isinstance(outcome, Exception):
+                raise outcome
+            result, replayed = outcome
             
             # Check if it was successful
-            if "✅ Found" in result or "❌ No flights found" in result:
-                print(f"   ✅ API call successful")
-                print(f"   📊 Result: {result[:100]}...")
+            success = _is_success(result)
+            if success:
+                print(f"   ✅ API call successful", file=buf)
+                print(f"   📊 Result: {result[:100]}...", file=buf)
                 
-                # Check if data was saved
-                if "Flight data saved to" in result or "Flight data appended to" in result:
-                    print(f"   💾 Data storage: SUCCESS")
+                # Check if data was saved (a replayed result wrote nothing this run)
+                if replayed:
+                    print(f"   ♻️  Replayed cached result: data storage not checked", file=buf)
+                elif "Flight data saved to" in result or "Flight data appended to" in result:
+                    print(f"   💾 Data storage: SUCCESS", file=buf)
                 else:
-                    print(f"   ❌ Data storage: FAILED")
+                    print(f"   ❌ Data storage: FAILED", file=buf)
                     
             elif "Error:" in result:
-                print(f"   ❌ API call failed: {result}")
+                print(f"   ❌ API call failed: {result}", file=buf)
             else:
-                print(f"   ⚠️  Unexpected response: {result[:100]}...")
+                print(f"   ⚠️  Unexpected response: {result[:100]}...", file=buf)
                 
             results.append({
                 "route": f"{route['FROM']} → {route['TO']}",
-                "success": "✅ Found" in result or "❌ No flights found" in result,
+                "success": success,
                 "result": result
             })
             
         except Exception as e:
-            print(f"   ❌ Exception occurred: {e}")
+            print(f"   ❌ Exception occurred: {e}", file=buf)
             results.append({
                 "route": f"{route['FROM']} → {route['TO']}",
                 "success": False,
                 "result": f"Exception: {e}"
             })
+        
+        sys.stdout.write(buf.getvalue())
     
     # Summary
     print("\n" + "=" * 60)
@@ -90,18 +170,23 @@ def test_tavily_api_integration():
     print(f"\n📁 Checking data files...")
     data_dir = "data"
     if os.path.exists(data_dir):
-        files = os.listdir(data_dir)
-        json_files = [f for f in files if f.endswith('.json')]
-        flight_files = [f for f in json_files if f.startswith('flight_prices_')]
+        # One directory pass; DirEntry.stat() reuses the scan's stat data
+        json_count = 0
+        flight_files = []
+        with os.scandir(data_dir) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith(('.json', '.jsonl')):
+                    json_count += 1
+                    # Route histories only, not their .summary.json sidecars
+                    if entry.name.startswith('flight_prices_') and not entry.name.endswith('.summary.json'):
+                        flight_files.append((entry.name, entry.stat().st_size))
         
-        print(f"   📄 Total JSON files: {len(json_files)}")
+        print(f"   📄 Total JSON files: {json_count}")
         print(f"   ✈️  Flight price files: {len(flight_files)}")
         
         if flight_files:
             print(f"   📋 Latest files:")
-            for file in sorted(flight_files)[-3:]:  # Show last 3 files
-                file_path = os.path.join(data_dir, file)
-                file_size = os.path.getsize(file_path)
+            for file, file_size in reversed(heapq.nlargest(3, flight_files)):  # Show last 3 files
                 print(f"      - {file} ({file_size} bytes)")
     
     # Final assessment
@@ -115,6 +200,19 @@ def test_tavily_api_integration():
     
     return successful_tests >= 2
 
+@contextlib.contextmanager
+def _network_tripwire():
+    """
+    Fail any attempt to reach the Tavily API during the block.
+    
+    The tracker catches request errors itself, so the mocks also record the hit;
+    the yielded callable reports whether the network was touched.
+    """
+    hit = AssertionError("network hit")
+    with mock.patch.object(tracker_module._SESSION, "post", side_effect=hit) as post, \
+         mock.patch.object(tracker_module, "_get_http_session", side_effect=hit) as session:
+        yield lambda: post.called or session.called
+
 def test_error_handling():
     """Test error handling scenarios"""
     
@@ -124,9 +222,12 @@ def test_error_handling():
     # Test 1: Missing parameters
     print(f"Test 1: Missing parameters")
     try:
-        result = tavily_price_tracker({"FROM": "Toronto"})  # Missing TO and maxPrice
+        with _network_tripwire() as network_hit:
+            result = tavily_price_tracker.invoke(_tool_input({"FROM": "Toronto"}))  # Missing TO and maxPrice
         print(f"   Result: {result}")
-        if "Error: Missing required parameters" in result:
+        if network_hit():
+            print(f"   ❌ Error handling: FAILED (validation reached the network)")
+        elif "Error: Missing required parameters" in result:
             print(f"   ✅ Error handling: PASSED")
         else:
             print(f"   ❌ Error handling: FAILED")
@@ -136,22 +237,32 @@ def test_error_handling():
     # Test 2: Invalid maxPrice
     print(f"Test 2: Invalid maxPrice")
     try:
-        result = tavily_price_tracker({"FROM": "Toronto", "TO": "Ottawa", "maxPrice": "invalid"})
+        with _network_tripwire() as network_hit:
+            result = tavily_price_tracker.invoke(_tool_input({"FROM": "Toronto", "TO": "Ottawa", "maxPrice": "invalid"}))
         print(f"   Result: {result}")
-        if "Error: maxPrice must be a valid integer" in result:
+        if network_hit():
+            print(f"   ❌ Error handling: FAILED (validation reached the network)")
+        elif "Error: max_price must be a valid integer" in result:
             print(f"   ✅ Error handling: PASSED")
         else:
             print(f"   ❌ Error handling: FAILED")
     except Exception as e:
         print(f"   ❌ Exception: {e}")
 
+async def main():
+    """Run the integration tests, then close the tracker's shared HTTP session."""
+    try:
+        return await test_tavily_api_integration()
+    finally:
+        await tracker_module.aclose_http_session()
+
 if __name__ == "__main__":
     print("Starting Task 4: Testing & Validation")
     print("Make sure you have TAVILY_API_KEY set in your environment!")
     print()
     
     # Test main functionality
-    main_success = test_tavily_api_integration()
+    main_success = asyncio.run(main())
     
     # Test error handling
     test_error_handling()
@@ -5,7 +5,7 @@ This script tests the basic async functionality we'll need for the price monitor
 """
 
 import asyncio
-import json
+import orjson
 import os
 from pathlib import Path
 
@@ -13,12 +13,19 @@ from pathlib import Path
 try:
     import langchain
     import langchain_community
-    import aiofiles
     print("✅ All required packages imported successfully")
 except ImportError as e:
     print(f"❌ Import error: {e}")
     exit(1)
 
+def _sync_write_json(path: Path, data: dict):
+    """Write JSON data to a file (run in a worker thread)."""
+    path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+
+def _sync_read_json(path: Path) -> dict:
+    """Read JSON data from a file (run in a worker thread)."""
+    return orjson.loads(path.read_bytes())
+
 async def test_async_basic():
     """Test basic async functionality"""
     print("Testing basic async functionality...")
@@ -45,13 +52,11 @@ async def test_async_file_operations():
     test_file = Path("src/data/test_flight_prices.json")
     test_file.parent.mkdir(parents=True, exist_ok=True)
     
-    async with aiofiles.open(test_file, 'w') as f:
-        await f.write(json.dumps(test_data, indent=2))
+    # One thread dispatch per operation instead of separate open/read/close awaits
+    await asyncio.to_thread(_sync_write_json, test_file, test_data)
     
     # Read test file
-    async with aiofiles.open(test_file, 'r') as f:
-        content = await f.read()
-        loaded_data = json.loads(content)
+    loaded_data = await asyncio.to_thread(_sync_read_json, test_file)
     
     # Clean up
     test_file.unlink()
@@ -71,7 +76,6 @@ async def main():
     print("🚀 Starting LangChain async environment tests...")
     print(f"LangChain version: {langchain.__version__}")
     print(f"LangChain Community version: {langchain_community.__version__}")
-    print("aiofiles installed and available")
     print("-" * 50)
     
     await test_async_basic()
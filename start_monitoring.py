@@ -5,7 +5,8 @@ Simple script to start monitoring Firebase for new flight searches
 
 import sys
 import os
-import time
+import signal
+import threading
 from pathlib import Path
 
 # Add the parent directory to sys.path so we can import our modules
@@ -52,15 +53,17 @@ def main():
     print("🛑 Press Ctrl+C to stop the service")
     print()
     
+    # Ctrl+C sets the event instead of raising KeyboardInterrupt
+    stop_event = threading.Event()
+    signal.signal(signal.SIGINT, lambda *_: stop_event.set())
+    
     try:
         # Start the listener with agent
         listener = start_firebase_listener(agent=agent, poll_interval=poll_interval)
         
-        # Keep the service running
-        while True:
-            time.sleep(1)
-            
-    except KeyboardInterrupt:
+        # Block until Ctrl+C without waking up in the meantime
+        stop_event.wait()
+        
         print("\n🛑 Stopping service...")
         stop_firebase_listener()
         print("✅ Service stopped successfully")
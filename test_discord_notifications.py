@@ -6,14 +6,95 @@ Test script to trigger Discord notifications and verify they appear in Discord c
 import sys
 import os
 import asyncio
-import json
-import requests
+from collections import defaultdict
+from pathlib import Path
+import numpy as np
+import orjson
 from datetime import datetime
 
 # Add the src directory to Python path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
 from agent.real_time_data_manager import RealTimeDataManager
+from tools.tavily_price_tracker import aclose_http_session
+from test_discord_simple import get_session, close_session
+
+CONFIG_PATH = Path("config/notification_config.json")
+
+# Above this many flights the threshold scan runs in numpy instead of Python
+VECTOR_FILTER_MIN = 1000
+
+# Embed description skeleton, filled per flight with format_map
+_DESC_TMPL = (
+    "**Price Drop Detected!**\n\n"
+    "💰 **Price:** ${price}\n"
+    "✈️ **Airline:** {airline}\n"
+    "🛫 **Route:** {departure} → {destination}\n"
+    "⏰ **Detected:** {detected}"
+)
+
+def load_webhook_url():
+    """
+    Read the Discord webhook URL from the notification config
+    
+    Returns:
+        tuple: (config_found, webhook_url), with webhook_url "" when not configured
+    """
+    try:
+        config = orjson.loads(CONFIG_PATH.read_bytes())
+    except FileNotFoundError:
+        return False, ""
+    except (OSError, ValueError) as e:
+        print(f"❌ Error loading notification config: {e}")
+        return True, ""
+    
+    webhook_url = config.get('discord_webhook_url', '')
+    if webhook_url == 'your_discord_webhook_url_here':
+        webhook_url = ""
+    return True, webhook_url
+
+# Snapshot of get_all_flight_data() kept in the data manager's directory, so reruns skip the per-route refresh
+FLIGHTS_CACHE_NAME = ".all_flights.orjson"
+
+def _is_flight_file(name):
+    """JSON Lines histories and legacy .json histories not yet migrated; summary sidecars are not flight files"""
+    return name.startswith("flight_prices_") and (
+        name.endswith(".jsonl") or (name.endswith(".json") and not name.endswith(".summary.json"))
+    )
+
+def _flight_files_key(data_dir="data"):
+    """[name, mtime_ns] for every flight price file, so added, removed or replaced files all change it"""
+    try:
+        with os.scandir(data_dir) as it:
+            return sorted([e.name, e.stat().st_mtime_ns] for e in it if _is_flight_file(e.name))
+    except OSError:
+        return []
+
+async def load_all_flights(data_manager):
+    """
+    Load all flight data, reusing the cached snapshot while no flight file has changed
+    
+    Returns:
+        list: Flight dictionaries from every known route
+    """
+    flights_cache = Path(data_manager.data_dir) / FLIGHTS_CACHE_NAME
+    try:
+        cache = orjson.loads(flights_cache.read_bytes())
+        if cache["files"] == _flight_files_key(data_manager.data_dir):
+            print("⚡ Using cached flight data snapshot (flight files unchanged; live Tavily refresh skipped)")
+            print(f"   Delete {flights_cache} to force a refresh")
+            return cache["flights"]
+    except (OSError, orjson.JSONDecodeError, KeyError, TypeError):
+        pass
+    
+    all_flights = await data_manager.get_all_flight_data()
+    
+    # Key on the files as they are after loading, since loading may refresh them
+    flights_cache.write_bytes(orjson.dumps({
+        "files": _flight_files_key(data_manager.data_dir),
+        "flights": all_flights
+    }))
+    return all_flights
 
 class DiscordNotificationTester:
     """Test class to trigger Discord notifications"""
@@ -22,57 +103,74 @@ class DiscordNotificationTester:
         self.notifications_sent = []
         self.price_drops_detected = 0
         
+        # Read the webhook URL once instead of on every notification
+        self.config_found, self.webhook_url = load_webhook_url()
+        self.session = None
+    
+    async def __aenter__(self):
+        """Attach the process-wide webhook session (closed by main)"""
+        self.session = await get_session()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        self.session = None
+        
     async def test_discord_notification_callback(self, flight_data):
         """Callback function to test Discord notifications"""
         print(f"🔔 Discord notification callback triggered with {len(flight_data)} flights")
         
+        # One timestamp for the whole batch of alerts
+        now = datetime.now()
+        now_iso = now.isoformat()
+        now_fmt = now.strftime('%Y-%m-%d %H:%M:%S')
+        
         # Check for price drops below threshold
         threshold = 200  # From config
-        for flight in flight_data:
-            if flight.get('price', 0) < threshold:
-                self.price_drops_detected += 1
-                notification = {
-                    "timestamp": datetime.now().isoformat(),
-                    "type": "price_drop",
-                    "flight": flight,
-                    "threshold": threshold
-                }
-                self.notifications_sent.append(notification)
-                
-                # Send Discord notification
-                await self.send_discord_notification(flight)
-                
-                print(f"🚨 PRICE DROP ALERT: ${flight.get('price')} for {flight.get('airline', 'Unknown')}")
+        if len(flight_data) > VECTOR_FILTER_MIN:
+            prices = np.fromiter((f.get('price', 0) for f in flight_data), dtype=np.float64, count=len(flight_data))
+            alerts = [flight_data[i] for i in np.flatnonzero(prices < threshold)]
+        else:
+            alerts = [f for f in flight_data if f.get('price', 0) < threshold]
+        
+        # Send all Discord notifications concurrently
+        await asyncio.gather(
+            *(self.send_discord_notification(flight, now_iso, now_fmt) for flight in alerts),
+            return_exceptions=True
+        )
+        
+        for flight in alerts:
+            self.price_drops_detected += 1
+            notification = {
+                "timestamp": now_iso,
+                "type": "price_drop",
+                "flight": flight,
+                "threshold": threshold
+            }
+            self.notifications_sent.append(notification)
+            print(f"🚨 PRICE DROP ALERT: ${flight.get('price')} for {flight.get('airline', 'Unknown')}")
         
         print(f"📊 Current stats: {self.price_drops_detected} price drops detected")
     
-    async def send_discord_notification(self, flight):
-        """Send notification to Discord webhook"""
+    async def send_discord_notification(self, flight, now_iso, now_fmt):
+        """Send notification to Discord webhook (timestamps are precomputed by the caller)"""
         try:
-            # Load Discord webhook URL from config
-            config_path = "config/notification_config.json"
-            if os.path.exists(config_path):
-                with open(config_path, 'r') as f:
-                    config = json.load(f)
-                
-                webhook_url = config.get('discord_webhook_url', '')
-                if not webhook_url or webhook_url == 'your_discord_webhook_url_here':
+            if self.config_found:
+                webhook_url = self.webhook_url
+                if not webhook_url:
                     print("⚠️  Discord webhook not configured")
                     return
                 
                 # Create Discord message
                 embed = {
                     "title": "🚨 Flight Price Drop Alert!",
-                    "description": f"**Price Drop Detected!**\n\n"
-                                 f"💰 **Price:** ${flight.get('price', 'Unknown')}\n"
-                                 f"✈️ **Airline:** {flight.get('airline', 'Unknown')}\n"
-                                 f"🛫 **Route:** {flight.get('departure', 'Unknown')} → {flight.get('destination', 'Unknown')}\n"
-                                 f"⏰ **Detected:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+                    "description": _DESC_TMPL.format_map(
+                        defaultdict(lambda: 'Unknown', flight, detected=now_fmt)
+                    ),
                     "color": 0xFF0000,  # Red color
                     "footer": {
                         "text": "AirReserve Price Monitor"
                     },
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": now_iso
                 }
                 
                 payload = {
@@ -81,12 +179,11 @@ class DiscordNotificationTester:
                 }
                 
                 # Send to Discord
-                response = requests.post(webhook_url, json=payload, timeout=10)
-                
-                if response.status_code == 204:
-                    print(f"✅ Discord notification sent successfully!")
-                else:
-                    print(f"❌ Discord notification failed: {response.status_code} - {response.text}")
+                async with self.session.post(webhook_url, json=payload) as response:
+                    if response.status == 204:
+                        print(f"✅ Discord notification sent successfully!")
+                    else:
+                        print(f"❌ Discord notification failed: {response.status} - {await response.text()}")
                     
             else:
                 print("❌ Notification config file not found")
@@ -104,95 +201,90 @@ async def test_discord_notifications():
     
     # Initialize the data manager
     data_manager = RealTimeDataManager(data_dir="data", refresh_interval=30)  # Shorter interval for testing
-    notification_tester = DiscordNotificationTester()
-    
-    print("\n📋 Test 1: Loading flight data and triggering notifications")
-    print("-" * 50)
+    async with DiscordNotificationTester() as notification_tester:
+        print("\n📋 Test 1: Loading flight data and triggering notifications")
+        print("-" * 50)
     
-    try:
-        # Get all flight data
-        all_flights = await data_manager.get_all_flight_data()
-        print(f"✅ Loaded {len(all_flights)} flights from data files")
+        try:
+            # Get all flight data
+            all_flights = await load_all_flights(data_manager)
+            print(f"✅ Loaded {len(all_flights)} flights from data files")
         
-        if all_flights:
-            # Show what we found
-            print("\n📊 Flight data found:")
-            for i, flight in enumerate(all_flights[:5], 1):  # Show first 5
-                price = flight.get('price', 'Unknown')
-                airline = flight.get('airline', 'Unknown')
-                print(f"   {i}. ${price} - {airline}")
+            if all_flights:
+                # Show what we found
+                print("\n📊 Flight data found:")
+                for i, flight in enumerate(all_flights[:5], 1):  # Show first 5
+                    price = flight.get('price', 'Unknown')
+                    airline = flight.get('airline', 'Unknown')
+                    print(f"   {i}. ${price} - {airline}")
             
-            # Trigger notification callback with the data
-            print(f"\n🔔 Triggering notification callback...")
-            await notification_tester.test_discord_notification_callback(all_flights)
+                # Trigger notification callback with the data
+                print(f"\n🔔 Triggering notification callback...")
+                await notification_tester.test_discord_notification_callback(all_flights)
             
-            print(f"\n📊 Notification Summary:")
-            print(f"   📊 Price drops detected: {notification_tester.price_drops_detected}")
-            print(f"   🔔 Discord notifications sent: {len(notification_tester.notifications_sent)}")
+                print(f"\n📊 Notification Summary:")
+                print(f"   📊 Price drops detected: {notification_tester.price_drops_detected}")
+                print(f"   🔔 Discord notifications sent: {len(notification_tester.notifications_sent)}")
             
-            if notification_tester.notifications_sent:
-                print(f"\n📝 Recent notifications:")
-                for notif in notification_tester.notifications_sent[-3:]:  # Show last 3
-                    flight = notif['flight']
-                    print(f"      ${flight.get('price')} - {flight.get('airline', 'Unknown')}")
-        else:
-            print("⚠️  No flight data found. Creating test data...")
+                if notification_tester.notifications_sent:
+                    print(f"\n📝 Recent notifications:")
+                    for notif in notification_tester.notifications_sent[-3:]:  # Show last 3
+                        flight = notif['flight']
+                        print(f"      ${flight.get('price')} - {flight.get('airline', 'Unknown')}")
+            else:
+                print("⚠️  No flight data found. Creating test data...")
             
-            # Create some test data to trigger notifications
-            test_flights = [
-                {"price": 150, "airline": "Test Air", "departure": "Toronto", "destination": "Vancouver", "timestamp": datetime.now().isoformat()},
-                {"price": 180, "airline": "Test Air", "departure": "Montreal", "destination": "Calgary", "timestamp": datetime.now().isoformat()},
-                {"price": 120, "airline": "Test Air", "departure": "Ottawa", "destination": "Edmonton", "timestamp": datetime.now().isoformat()}
-            ]
+                # Create some test data to trigger notifications
+                created_at = datetime.now().isoformat()
+                test_flights = [
+                    {"price": 150, "airline": "Test Air", "departure": "Toronto", "destination": "Vancouver", "timestamp": created_at},
+                    {"price": 180, "airline": "Test Air", "departure": "Montreal", "destination": "Calgary", "timestamp": created_at},
+                    {"price": 120, "airline": "Test Air", "departure": "Ottawa", "destination": "Edmonton", "timestamp": created_at}
+                ]
             
-            print("🔔 Triggering notification callback with test data...")
-            await notification_tester.test_discord_notification_callback(test_flights)
+                print("🔔 Triggering notification callback with test data...")
+                await notification_tester.test_discord_notification_callback(test_flights)
     
-    except Exception as e:
-        print(f"❌ Error in Discord notification test: {e}")
-        return False
+        except Exception as e:
+            print(f"❌ Error in Discord notification test: {e}")
+            return False
     
-    print("\n📋 Test 2: Manual Discord webhook test")
-    print("-" * 50)
+        print("\n📋 Test 2: Manual Discord webhook test")
+        print("-" * 50)
     
-    try:
-        # Test Discord webhook directly
-        config_path = "config/notification_config.json"
-        if os.path.exists(config_path):
-            with open(config_path, 'r') as f:
-                config = json.load(f)
-            
-            webhook_url = config.get('discord_webhook_url', '')
-            if webhook_url and webhook_url != 'your_discord_webhook_url_here':
-                print("🔗 Testing Discord webhook directly...")
-                
-                # Send a test message
-                test_payload = {
-                    "content": "🧪 **TEST MESSAGE** - This is a test notification from AirReserve LangChain Agent!",
-                    "embeds": [{
-                        "title": "🧪 Test Notification",
-                        "description": "If you see this message, your Discord webhook is working correctly!",
-                        "color": 0x00FF00,  # Green color
-                        "timestamp": datetime.now().isoformat()
-                    }]
-                }
+        try:
+            # Test Discord webhook directly (URL already loaded by the tester)
+            if notification_tester.config_found:
+                webhook_url = notification_tester.webhook_url
+                if webhook_url:
+                    print("🔗 Testing Discord webhook directly...")
                 
-                response = requests.post(webhook_url, json=test_payload, timeout=10)
+                    # Send a test message
+                    test_payload = {
+                        "content": "🧪 **TEST MESSAGE** - This is a test notification from AirReserve LangChain Agent!",
+                        "embeds": [{
+                            "title": "🧪 Test Notification",
+                            "description": "If you see this message, your Discord webhook is working correctly!",
+                            "color": 0x00FF00,  # Green color
+                            "timestamp": datetime.now().isoformat()
+                        }]
+                    }
                 
-                if response.status_code == 204:
-                    print("✅ Test Discord message sent successfully!")
-                    print("📱 Check your Discord channel for the test message")
+                    async with notification_tester.session.post(webhook_url, json=test_payload) as response:
+                        if response.status == 204:
+                            print("✅ Test Discord message sent successfully!")
+                            print("📱 Check your Discord channel for the test message")
+                        else:
+                            print(f"❌ Test Discord message failed: {response.status} - {await response.text()}")
                 else:
-                    print(f"❌ Test Discord message failed: {response.status_code} - {response.text}")
+                    print("⚠️  Discord webhook not configured in config file")
             else:
-                print("⚠️  Discord webhook not configured in config file")
-        else:
-            print("❌ Notification config file not found")
+                print("❌ Notification config file not found")
     
-    except Exception as e:
-        print(f"❌ Error in manual Discord test: {e}")
+        except Exception as e:
+            print(f"❌ Error in manual Discord test: {e}")
     
-    return True
+        return True
 
 async def main():
     """Main test function"""
@@ -201,7 +293,11 @@ async def main():
     print(f"Test started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     
     # Run Discord notification tests
-    success = await test_discord_notifications()
+    try:
+        success = await test_discord_notifications()
+    finally:
+        await close_session()
+        await aclose_http_session()
     
     print("\n" + "=" * 50)
     print("📊 DISCORD NOTIFICATION TEST SUMMARY")
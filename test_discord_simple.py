@@ -8,14 +8,32 @@ import asyncio
 import ssl
 import certifi
 
+# Built once and shared by every Discord webhook test
+_SSL_CTX = ssl.create_default_context(cafile=certifi.where())
+_session = None
+
+async def get_session():
+    """Return the process-wide webhook session, creating it on first use"""
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(ssl=_SSL_CTX, limit=10, keepalive_timeout=30),
+            timeout=aiohttp.ClientTimeout(total=10)
+        )
+    return _session
+
+async def close_session():
+    """Close the shared session (call once before the event loop shuts down)"""
+    global _session
+    if _session is not None:
+        await _session.close()
+        _session = None
+
 async def test_discord_webhook():
     """Test Discord webhook with SSL context"""
     
     webhook_url = "https://discord.com/api/webhooks/1391102467189637221/tql23WreNHxNlQ4Aaz-N3ELvWYLw4-R_S4bKHvZqmjykSxW53VKhQKjiT6K1p-44SLQr"
     
-    # Create SSL context with certifi
-    ssl_context = ssl.create_default_context(cafile=certifi.where())
-    
     # Test message
     message = {
         "content": "🧪 **Test Notification** - AirReserve is working!",
@@ -34,29 +52,32 @@ async def test_discord_webhook():
     try:
         print("🔗 Testing Discord webhook...")
         
-        # Create connector with SSL context
-        connector = aiohttp.TCPConnector(ssl=ssl_context)
-        
-        async with aiohttp.ClientSession(connector=connector) as session:
-            async with session.post(
-                webhook_url,
-                json=message,
-                headers={"Content-Type": "application/json"}
-            ) as response:
-                print(f"📡 Response status: {response.status}")
-                print(f"📡 Response text: {await response.text()}")
-                
-                if response.status == 204:
-                    print("✅ Discord notification sent successfully!")
-                    return True
-                else:
-                    print(f"❌ Failed to send Discord notification: {response.status}")
-                    return False
+        session = await get_session()
+        async with session.post(
+            webhook_url,
+            json=message,
+            headers={"Content-Type": "application/json"}
+        ) as response:
+            print(f"📡 Response status: {response.status}")
+            print(f"📡 Response text: {await response.text()}")
+            
+            if response.status == 204:
+                print("✅ Discord notification sent successfully!")
+                return True
+            else:
+                print(f"❌ Failed to send Discord notification: {response.status}")
+                return False
                     
     except Exception as e:
         print(f"❌ Error testing Discord webhook: {e}")
         return False
 
+async def main():
+    try:
+        await test_discord_webhook()
+    finally:
+        await close_session()
+
 if __name__ == "__main__":
     print("🧪 Starting Discord webhook test...")
-    asyncio.run(test_discord_webhook()) 
\ No newline at end of file
+    asyncio.run(main()) 
\ No newline at end of file
@@ -16,6 +16,7 @@ from datetime import datetime
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
 from agent.real_time_data_manager import RealTimeDataManager
+from tools.tavily_price_tracker import aclose_http_session
 
 class NotificationTester:
     """Test class to simulate notifications and verify functionality"""
@@ -265,11 +266,15 @@ async def main():
     print("Starting Issue 3 LangChain Agent Tests...")
     print(f"Test started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     
-    # Run main functionality tests
-    success = await test_real_time_data_manager()
-    
-    # Run error handling tests
-    await test_error_handling()
+    try:
+        # Run main functionality tests
+        success = await test_real_time_data_manager()
+        
+        # Run error handling tests
+        await test_error_handling()
+    finally:
+        # Data refreshes share the tracker's HTTP session; close it once before the loop exits
+        await aclose_http_session()
     
     print("\n" + "=" * 60)
     print("📊 ISSUE 3 TEST SUMMARY")
@@ -12,6 +12,7 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent / "src" / "agent" / "tools"))
 
 from langchain_notifier import send_notification, THRESHOLD
+from tavily_price_tracker import read_recent_searches
 
 async def test_notifications():
     """Test notifications with existing flight data"""
@@ -20,7 +21,7 @@ async def test_notifications():
     
     # Load flight data from the data directory
     data_dir = Path("data")
-    flight_files = list(data_dir.glob("flight_prices_*.json"))
+    flight_files = list(data_dir.glob("flight_prices_*.jsonl"))
     
     print(f"📁 Found {len(flight_files)} flight data files")
     
@@ -30,12 +31,11 @@ async def test_notifications():
         print(f"\n📄 Processing: {file_path.name}")
         
         try:
-            with open(file_path, 'r') as f:
-                data = json.load(f)
+            searches = read_recent_searches(file_path, 1)
             
             # Extract flights from the most recent search
-            if data.get("searches"):
-                latest_search = data["searches"][-1]
+            if searches:
+                latest_search = searches[-1]
                 flights = latest_search.get("flights", [])
                 
                 print(f"   Found {len(flights)} flights")